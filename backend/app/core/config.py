@@ -0,0 +1,18 @@
+import os
+
+from dotenv import load_dotenv
+
+# The one place .env is read; modules import their settings from here or,
+# for module-specific knobs, read os.environ after this has been imported.
+load_dotenv()
+
+ENVIRONMENT = os.getenv("ENVIRONMENT", "dev").lower()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+try:
+    ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+except ValueError:
+    ACCESS_TOKEN_EXPIRE_MINUTES = 60
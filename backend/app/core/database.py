@@ -1,24 +1,85 @@
+import os
+import threading
+from typing import Optional
+
+from fastapi import Depends
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-load_dotenv()
+from app.core.config import DATABASE_URL
+from app.core.db_instrumentation import InstrumentedQueuePool, instrument_engine
 
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
-if SQLALCHEMY_DATABASE_URL and "sslmode=" not in SQLALCHEMY_DATABASE_URL:
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
+IS_SQLITE = bool(SQLALCHEMY_DATABASE_URL) and SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+if SQLALCHEMY_DATABASE_URL and not IS_SQLITE and "sslmode=" not in SQLALCHEMY_DATABASE_URL:
     separator = '&' if '?' in SQLALCHEMY_DATABASE_URL else '?'
     SQLALCHEMY_DATABASE_URL = f"{SQLALCHEMY_DATABASE_URL}{separator}sslmode=require"
 
-# Engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"sslmode": "require"}  # For Supabase/Postgres
-)
+# Engine: created on first use, so importing the app does not load the DB driver
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def _create_engine() -> Engine:
+    if IS_SQLITE:
+        # Local benchmarks and checks: one shared connection for in-memory databases
+        return create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool if SQLALCHEMY_DATABASE_URL in ("sqlite://", "sqlite:///:memory:") else InstrumentedQueuePool,
+        )
+    return create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"sslmode": "require"},  # For Supabase/Postgres
+        poolclass=InstrumentedQueuePool,  # pool wait feeds admission control
+    )
+
+
+def get_engine() -> Engine:
+    """Return the process-wide engine, creating and instrumenting it on first call."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = _create_engine()
+                instrument_engine(engine)
+                SessionLocal.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+
+def _dispose_after_fork():
+    # Pooled connections belong to the parent: drop them without closing the
+    # parent's sockets, so the child opens its own on first use
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
+
+def __getattr__(name: str):
+    # `from app.core.database import engine` keeps working, creating it on demand
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySessionmaker(sessionmaker):
+    """Binds to the engine the first time a session is opened."""
+
+    def __call__(self, **local_kw):
+        if _engine is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
 
 # Session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 
 # Base for models
 Base = declarative_base()
@@ -30,3 +91,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_mutation_db(db: Session = Depends(get_db)):
+    """
+    The request's session (shared with `get_current_user`) switched to keep
+    loaded state after commit, for routes that write and then answer from the
+    objects they wrote. Without it every attribute read after `commit()` --
+    including `current_user.name` -- is another SELECT. Values the database
+    generates on INSERT (ids, server defaults) come back via RETURNING at
+    flush, so no `db.refresh()` is needed either.
+    """
+    db.expire_on_commit = False
+    return db
@@ -0,0 +1,113 @@
+import math
+import threading
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.services.metrics import DB_POOL_WAIT, DB_QUERIES_TOTAL
+
+
+@dataclass
+class RequestQueryStats:
+    """SQL activity attributed to one request."""
+    count: int = 0
+    duration: float = 0.0
+    # (statement, seconds) pairs, recorded only when tracing is enabled
+    statements: Optional[List[Tuple[str, float]]] = None
+    # Threads that executed statements for the request (slow-request profiles)
+    threads: Set[int] = field(default_factory=set)
+
+
+# Set by the request middleware; copied into threadpool workers with the context
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def begin_request_stats(trace: bool = False) -> Tuple[RequestQueryStats, Token]:
+    stats = RequestQueryStats(statements=[] if trace else None)
+    return stats, _current_stats.set(stats)
+
+
+def end_request_stats(token: Token):
+    _current_stats.reset(token)
+
+
+def current_request_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+def instrument_engine(engine: Engine):
+    """
+    Count and time every statement executed through `engine`.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERIES_TOTAL.inc()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+            stats.threads.add(threading.get_ident())
+            if stats.statements is not None:
+                stats.statements.append((statement, elapsed))
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+# ----------------- POOL WAIT -----------------
+class DecayingAverage:
+    """
+    Exponentially weighted average of samples that also decays toward zero
+    while no samples arrive, so a value measured during a burst does not
+    stick once the traffic that produced it is gone.
+    """
+    def __init__(self, half_life: float):
+        self.half_life = half_life
+        self._value = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _decayed(self, now: float) -> float:
+        return self._value * math.pow(0.5, (now - self._updated_at) / self.half_life)
+
+    def observe(self, sample: float):
+        with self._lock:
+            now = time.monotonic()
+            current = self._decayed(now)
+            # A sample weighs as much as the decay over a tenth of the half-life
+            self._value = current + (sample - current) * 0.1
+            self._updated_at = now
+
+    def value(self) -> float:
+        with self._lock:
+            return self._decayed(time.monotonic())
+
+
+# Recent time requests waited for a pooled connection (admission control)
+pool_wait = DecayingAverage(half_life=2.0)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            DB_POOL_WAIT.observe(elapsed)
+            pool_wait.observe(elapsed)
@@ -0,0 +1,89 @@
+import logging
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.core.db_instrumentation import RequestQueryStats
+
+# Opt-in: record every statement per request and flag N+1 patterns (staging)
+SQL_TRACE_ENABLED = os.getenv("SQL_TRACE", "false").lower() in ["1", "true", "yes"]
+# A statement shape executed this many times within one request is reported
+SQL_TRACE_REPEAT_THRESHOLD = int(os.getenv("SQL_TRACE_REPEAT_THRESHOLD", "3"))
+
+SQL_TRACE_HEADER = "X-SQL-Trace"
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+|\$\d+))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Reduce a statement to its shape: literals and parameter lists are
+    collapsed, so `... WHERE id = 1` and `... WHERE id = 2` compare equal.
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _NUMBER.sub("?", shape)
+
+
+@dataclass
+class RepeatedStatement:
+    shape: str
+    count: int
+    duration: float
+
+
+@dataclass
+class QueryTraceSummary:
+    count: int
+    duration: float
+    repeated: List[RepeatedStatement] = field(default_factory=list)
+
+    @property
+    def has_n_plus_one(self) -> bool:
+        return bool(self.repeated)
+
+
+def summarize(stats: RequestQueryStats, threshold: Optional[int] = None) -> QueryTraceSummary:
+    """
+    Group the recorded statements by shape and report shapes repeated at
+    least `threshold` times, most frequent first.
+    """
+    threshold = threshold or SQL_TRACE_REPEAT_THRESHOLD
+    counts = defaultdict(int)
+    durations = defaultdict(float)
+    for statement, elapsed in stats.statements or []:
+        shape = statement_shape(statement)
+        counts[shape] += 1
+        durations[shape] += elapsed
+
+    repeated = [
+        RepeatedStatement(shape=shape, count=count, duration=durations[shape])
+        for shape, count in counts.items()
+        if count >= threshold
+    ]
+    repeated.sort(key=lambda r: r.count, reverse=True)
+    return QueryTraceSummary(count=stats.count, duration=stats.duration, repeated=repeated)
+
+
+def format_header(summary: QueryTraceSummary) -> str:
+    return f"queries={summary.count}; time_ms={summary.duration * 1000:.1f}; repeated={len(summary.repeated)}"
+
+
+def log_summary(method: str, path: str, summary: QueryTraceSummary):
+    """
+    One log line per request; a warning listing the offending shapes when
+    a repeated statement suggests an N+1 pattern.
+    """
+    if not summary.has_n_plus_one:
+        logger.info(f"[SQL] {method} {path}: {format_header(summary)}")
+        return
+    details = "; ".join(f"{r.count}x ({r.duration * 1000:.1f}ms) {r.shape}" for r in summary.repeated)
+    logger.warning(f"[SQL] Possible N+1 in {method} {path}: {format_header(summary)} | {details}")
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 import os
@@ -6,11 +7,44 @@ import os
 from app.routers import auth, users, tasks, teams
 from app.routers import projects as projects_router
 from app.routers import admin as admin_router
+from app.routers import metrics as metrics_router
+from app.routers import dashboard as dashboard_router
+from app.routers import exports as exports_router
+
+# Middleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.admission import AdmissionMiddleware
 
 # WebSocket manager
 from app.services.websocket_manager import manager
 
-app = FastAPI(title="Project Team Management")
+# Email delivery
+from app.services.email_service import email_transport
+
+# Diagnostics
+from app.services.profiler import slow_request_recorder
+from app.services.loop_monitor import loop_monitor
+
+
+# ----------------- LIFESPAN -----------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    slow_request_recorder.start()
+    loop_monitor.start()
+    yield
+    # Graceful shutdown: in-flight requests have finished; release clients
+    await manager.close_all()
+    await email_transport.drain()
+    await loop_monitor.stop()
+    slow_request_recorder.stop()
+
+
+app = FastAPI(title="Project Team Management", lifespan=lifespan)
+
+# ----------------- ADMISSION CONTROL -----------------
+# Added first so it runs inside CORS (rejections still carry CORS headers)
+# and inside metrics (rejections are counted)
+app.add_middleware(AdmissionMiddleware)
 
 # ----------------- CORS -----------------
 default_origins = [
@@ -40,6 +74,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ----------------- METRICS -----------------
+# Added last so it is the outermost middleware and sees every response
+app.add_middleware(MetricsMiddleware)
+
 # ----------------- ROOT -----------------
 @app.get("/")
 def root():
@@ -52,6 +90,9 @@ app.include_router(projects_router.router)
 app.include_router(tasks.router)
 app.include_router(teams.router)
 app.include_router(admin_router.router)
+app.include_router(dashboard_router.router)
+app.include_router(exports_router.router)
+app.include_router(metrics_router.router)
 
 # ----------------- WEBSOCKET -----------------
 @app.websocket("/ws/projects/{project_id}")
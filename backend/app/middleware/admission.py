@@ -0,0 +1,152 @@
+import math
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.db_instrumentation import pool_wait
+from app.services.metrics import ADMISSION_IN_FLIGHT, ADMISSION_REJECTED
+from app.utils.auth_utils import decode_access_token
+from app.utils.rate_limiter import TokenBucket
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() in ["1", "true", "yes"]
+# Shed with 503 when this many admitted requests are already in flight (0 disables)
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "256"))
+# Shed with 503 while the recent average DB pool wait is above this (0 disables)
+ADMISSION_MAX_POOL_WAIT_MS = float(os.getenv("ADMISSION_MAX_POOL_WAIT_MS", "500"))
+# Buckets kept in memory; the least recently used are dropped beyond this
+ADMISSION_MAX_BUCKETS = int(os.getenv("ADMISSION_MAX_BUCKETS", "50000"))
+
+
+def _limit(name: str, rate: str, burst: str) -> Tuple[float, float]:
+    return (
+        float(os.getenv(f"ADMISSION_{name}_RATE", rate)),
+        float(os.getenv(f"ADMISSION_{name}_BURST", burst)),
+    )
+
+
+# Route class -> (tokens per second, burst) for each user (or client IP when anonymous)
+ROUTE_CLASS_LIMITS: Dict[str, Tuple[float, float]] = {
+    "login": _limit("LOGIN", "0.2", "10"),
+    "test_email": _limit("TEST_EMAIL", "0.0167", "2"),
+    "mutation": _limit("MUTATION", "5", "20"),
+    "read": _limit("READ", "20", "60"),
+}
+
+# Never limited: health check, scrapes and CORS preflights
+EXEMPT_PATHS = {"/", "/metrics"}
+
+READ_METHODS = {"GET", "HEAD"}
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Classify a request for rate limiting; None means exempt."""
+    if method == "OPTIONS" or path in EXEMPT_PATHS:
+        return None
+    if path == "/auth/test-email":
+        return "test_email"
+    if path in ("/auth/login", "/auth/register"):
+        return "login"
+    return "read" if method in READ_METHODS else "mutation"
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def client_identity(scope) -> str:
+    """
+    The user (JWT `sub`) for authenticated requests, else the client address.
+    Tokens are verified, so a forged `sub` cannot borrow someone else's budget.
+    """
+    authorization = _header(scope, b"authorization")
+    if authorization and authorization[:7].lower() == "bearer ":
+        payload = decode_access_token(authorization[7:].strip())
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware deciding, before any work is done, whether a
+    request is served:
+
+    - each user (or anonymous client IP) has a token bucket per route class
+      (login, test email, mutations, reads); an empty bucket answers 429
+      with Retry-After
+    - when the worker is saturated (too many admitted requests in flight,
+      or requests recently waited too long for a DB connection) new
+      requests are shed with 503 and Retry-After, so admitted requests keep
+      bounded latency instead of everyone queueing on the pool.
+    """
+    def __init__(self, app):
+        self.app = app
+        self.buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self.in_flight = 0
+
+    def _bucket(self, route_class_name: str, identity: str) -> TokenBucket:
+        key = (route_class_name, identity)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            rate, burst = ROUTE_CLASS_LIMITS[route_class_name]
+            bucket = self.buckets[key] = TokenBucket(rate, capacity=burst)
+            if len(self.buckets) > ADMISSION_MAX_BUCKETS:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket
+
+    def _overloaded(self) -> Optional[str]:
+        if ADMISSION_MAX_IN_FLIGHT and self.in_flight >= ADMISSION_MAX_IN_FLIGHT:
+            return "in_flight"
+        if ADMISSION_MAX_POOL_WAIT_MS and pool_wait.value() * 1000 > ADMISSION_MAX_POOL_WAIT_MS:
+            return "pool_wait"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        overloaded = self._overloaded()
+        if overloaded:
+            ADMISSION_REJECTED.inc(route_class=name, reason=overloaded)
+            await _reject(send, 503, "Server is busy, please retry shortly", 1)
+            return
+
+        bucket = self._bucket(name, client_identity(scope))
+        if not bucket.try_acquire():
+            ADMISSION_REJECTED.inc(route_class=name, reason="rate_limited")
+            await _reject(send, 429, "Too many requests", bucket.retry_after())
+            return
+
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            ADMISSION_IN_FLIGHT.dec()
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: float):
+    body = b'{"detail":"' + detail.encode() + b'"}'
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
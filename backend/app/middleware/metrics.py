@@ -0,0 +1,76 @@
+import threading
+import time
+
+from app.core.db_instrumentation import begin_request_stats, end_request_stats
+from app.core.query_tracer import SQL_TRACE_ENABLED, SQL_TRACE_HEADER, format_header, log_summary, summarize
+from app.services.profiler import slow_request_recorder
+from app.services.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_REQUESTS_TOTAL,
+)
+
+
+def route_template(scope) -> str:
+    """
+    The matched route path (e.g. "/tasks/{task_id}") keeps label cardinality bounded.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, status codes, in-flight
+    requests and the number of SQL statements and DB time of each request.
+    With SQL_TRACE enabled it also records every statement, adds an
+    X-SQL-Trace summary header and logs repeated statement shapes (N+1).
+    Requests slower than SLOW_REQUEST_THRESHOLD_MS get their stack profile captured.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        started_monotonic = time.monotonic()
+        stats, token = begin_request_stats(trace=SQL_TRACE_ENABLED)
+        stats.threads.add(threading.get_ident())
+        status_code = 500
+        responded_at = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, responded_at
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SQL_TRACE_ENABLED:
+                    header = format_header(summarize(stats)).encode("latin-1")
+                    message = {**message, "headers": [*message.get("headers", []), (SQL_TRACE_HEADER.lower().encode("latin-1"), header)]}
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after this point; they are not part of the latency
+                responded_at = time.perf_counter()
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            end_request_stats(token)
+            method = scope["method"]
+            route = route_template(scope)
+            elapsed = (responded_at or time.perf_counter()) - start
+            HTTP_REQUEST_DURATION.observe(elapsed, method=method, route=route)
+            HTTP_REQUESTS_TOTAL.inc(method=method, route=route, status=status_code)
+            DB_QUERIES_PER_REQUEST.observe(stats.count, method=method, route=route)
+            DB_TIME_PER_REQUEST.observe(stats.duration, method=method, route=route)
+            if SQL_TRACE_ENABLED:
+                log_summary(method, scope["path"], summarize(stats))
+            slow_request_recorder.observe(
+                method, scope["path"], route, started_monotonic, time.monotonic(), stats.threads
+            )
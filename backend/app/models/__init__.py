@@ -3,3 +3,5 @@ from .user import User
 from .task import Task
 from .project import Project
 from .team import Team
+from .metric_counter import MetricCounter
+from .scope_version import ScopeVersion
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, BigInteger
+from app.core.database import Base
+
+
+class MetricCounter(Base):
+    """
+    Incrementally maintained row counts backing the admin dashboard metrics.
+    """
+    __tablename__ = "metric_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0, server_default="0")
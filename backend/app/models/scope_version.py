@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, BigInteger
+from app.core.database import Base
+
+
+class ScopeVersion(Base):
+    """
+    Monotonic version per cache scope (a project, a user, or a global list),
+    bumped in the same transaction as every write that changes the scope.
+    """
+    __tablename__ = "scope_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
@@ -17,6 +17,8 @@ class Task(Base):
     status = Column(Enum(TaskStatus), default=TaskStatus.in_progress)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     assigned_to_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Incremented by every update; compared against If-Match for optimistic concurrency
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     project = relationship("Project", back_populates="tasks")
     assigned_to = relationship("User", back_populates="tasks_assigned")
@@ -1,30 +1,145 @@
-from fastapi import APIRouter, Depends, status
+import asyncio
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, get_mutation_db
 from app.utils.role_checker import get_current_user, require_role
-from app.models.user import User as UserModel
-from app.models.project import Project as ProjectModel
-from app.models.team import Team as TeamModel
-from app.models.task import Task as TaskModel
+from app.models.project import ProjectStatus
+from app.models.task import TaskStatus
+from app.services.counter_service import read_counters, status_key
+from app.services.profiler import SamplingProfiler, render_folded, slow_request_recorder
+from app.services.loop_monitor import loop_monitor
+from app.services.bulk_import import IMPORT_FORMATS, IMPORTERS, run_import
+from app.services.websocket_manager import manager
+from app.schemas.import_schema import ImportResult
 
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_role("admin"))])
 
+# Only one on-demand profile may run at a time
+_profile_lock = asyncio.Lock()
+
 
 @router.get("/metrics", status_code=status.HTTP_200_OK)
 def get_metrics(db: Session = Depends(get_db), user=Depends(get_current_user)) -> dict:
-    """Return high-level system metrics for the admin dashboard."""
-    users_count = db.query(UserModel).count()
-    projects_count = db.query(ProjectModel).count()
-    teams_count = db.query(TeamModel).count()
-    tasks_count = db.query(TaskModel).count()
+    """
+    Return high-level system metrics for the admin dashboard.
+    Served from the incrementally maintained counters table, so the cost
+    does not grow with the size of the data.
+    """
+    counters = read_counters(db)
+
+    return {
+        "users": counters.get("users", 0),
+        "projects": counters.get("projects", 0),
+        "teams": counters.get("teams", 0),
+        "tasks": counters.get("tasks", 0),
+        "tasks_by_status": {
+            s.value: counters.get(status_key("tasks.status", s), 0) for s in TaskStatus
+        },
+        "projects_by_status": {
+            s.value: counters.get(status_key("projects.status", s), 0) for s in ProjectStatus
+        },
+    }
+
+
+# ---------------- PROFILING ----------------
+@router.post("/profile", response_class=PlainTextResponse)
+async def run_profile(
+    seconds: int = Query(10, ge=1, le=120),
+    interval_ms: int = Query(5, ge=1, le=1000),
+) -> PlainTextResponse:
+    """
+    Sample every thread's stack for `seconds` and return the folded stacks
+    ("frame;frame;frame count" lines), ready for flamegraph.pl or speedscope.
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
+
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval=interval_ms / 1000)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            stacks = profiler.stop()
+
+    return PlainTextResponse(render_folded(stacks), headers={"X-Profile-Samples": str(profiler.samples)})
+
 
+@router.get("/slow-requests", status_code=status.HTTP_200_OK)
+def list_slow_requests() -> dict:
+    """List the captured slow requests, newest first."""
     return {
-        "users": users_count,
-        "projects": projects_count,
-        "teams": teams_count,
-        "tasks": tasks_count,
+        "enabled": slow_request_recorder.enabled,
+        "threshold_ms": slow_request_recorder.threshold * 1000,
+        "requests": slow_request_recorder.summaries(),
     }
 
 
+@router.get("/slow-requests/{record_id}", response_class=PlainTextResponse)
+def get_slow_request_profile(record_id: int) -> PlainTextResponse:
+    """Return the folded stack profile captured for one slow request."""
+    record = slow_request_recorder.get(record_id)
+    if not record:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slow request not found")
+    return PlainTextResponse(render_folded(record["stacks"]))
+
+
+@router.get("/loop-stalls", status_code=status.HTTP_200_OK)
+def list_loop_stalls() -> dict:
+    """
+    Event loop lag and, in LOOP_MONITOR_DEBUG mode, the stacks of callbacks
+    that held the loop beyond the stall threshold, newest first.
+    """
+    return {
+        "debug": loop_monitor.debug,
+        "last_lag_ms": round(loop_monitor.last_lag * 1000, 3),
+        "stall_threshold_ms": loop_monitor.stall_threshold * 1000,
+        "stalls": loop_monitor.recent_stalls(),
+    }
+
+
+# ---------------- BULK IMPORT ----------------
+@router.post("/import/{kind}", response_model=ImportResult, status_code=status.HTTP_200_OK)
+async def bulk_import(
+    kind: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="ndjson or csv; inferred from the file name when omitted"),
+    db: Session = Depends(get_mutation_db),
+) -> dict:
+    """
+    Import users, teams or tasks from an uploaded NDJSON or CSV file.
+    Rows are validated and inserted in batches with bulk statements; no
+    per-row emails or broadcasts are sent. Invalid rows are reported by
+    row number and skipped.
+    """
+    if kind not in IMPORTERS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown import kind '{kind}'")
+
+    fmt = format or (file.filename or "").rsplit(".", 1)[-1].lower()
+    if fmt == "jsonl":
+        fmt = "ndjson"
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}",
+        )
+
+    # Parsing, hashing and inserts are blocking: keep them off the event loop
+    report = await run_in_threadpool(run_import, db, kind, file.file, fmt)
+
+    # One summary broadcast per affected project instead of one per row
+    for project_id in sorted(report.project_ids):
+        await manager.broadcast(project_id, {
+            "event": "bulk_import",
+            "kind": kind,
+            "project_id": project_id,
+        })
+
+    return report.as_dict()
@@ -2,18 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.core.database import get_db
+from app.core.database import get_db, get_mutation_db
 from app.models.user import User
 from app.schemas.user_schema import UserCreate, UserResponse
 from app.utils.auth_utils import hash_password, verify_password, create_access_token
 from app.services.email_service import send_email
+from app.services.notification_service import invalidate_admin_emails
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 # ---------------- REGISTER ----------------
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)) -> User:
+def register(user: UserCreate, db: Session = Depends(get_mutation_db)) -> User:
     """
     Register a new user.
     Role defaults to 'member' if not provided.
@@ -32,7 +33,8 @@ def register(user: UserCreate, db: Session = Depends(get_db)) -> User:
 
     db.add(new_user)
     db.commit()
-    db.refresh(new_user)
+    if user.role == "admin":
+        invalidate_admin_emails()
     return new_user
 
 
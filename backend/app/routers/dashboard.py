@@ -0,0 +1,122 @@
+from collections import defaultdict
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.team import Team, team_members
+from app.models.user import User
+from app.schemas.dashboard_schema import DashboardSummaryResponse
+from app.utils.role_checker import get_current_user, visible_project_ids
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+def _status_value(status) -> str:
+    return status.value if isinstance(status, TaskStatus) else str(status)
+
+
+# ---------------- DASHBOARD SUMMARY ----------------
+@router.get("/summary", response_model=DashboardSummaryResponse)
+def get_dashboard_summary(
+    recent: int = Query(5, ge=0, le=50, description="Most recent tasks to include per project"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Per-project task, team and member counts plus recent tasks, computed with
+    grouped aggregates: five queries however many projects and tasks there are.
+    """
+    project_ids = visible_project_ids(current_user)
+
+    projects = (
+        db.query(Project.id, Project.name, Project.description, Project.status, Project.owner_id)
+        .filter(Project.id.in_(project_ids))
+        .order_by(Project.id)
+        .all()
+    )
+
+    # Task counts per project and status
+    task_counts = defaultdict(dict)
+    for project_id, status, count in (
+        db.query(Task.project_id, Task.status, func.count(Task.id))
+        .filter(Task.project_id.in_(project_ids))
+        .group_by(Task.project_id, Task.status)
+    ):
+        task_counts[project_id][_status_value(status)] = count
+
+    # Teams and distinct members per project
+    team_counts = {
+        project_id: (teams, members)
+        for project_id, teams, members in (
+            db.query(Team.project_id, func.count(distinct(Team.id)), func.count(distinct(team_members.c.user_id)))
+            .outerjoin(team_members, team_members.c.team_id == Team.id)
+            .filter(Team.project_id.in_(project_ids))
+            .group_by(Team.project_id)
+        )
+    }
+
+    # Tasks carry no timestamps, so the newest ids stand in for recent activity
+    recent_tasks = defaultdict(list)
+    if recent:
+        ranked = (
+            select(
+                Task.id, Task.title, Task.status, Task.assigned_to_id, Task.project_id,
+                func.row_number().over(partition_by=Task.project_id, order_by=Task.id.desc()).label("rank"),
+            )
+            .where(Task.project_id.in_(project_ids))
+            .subquery()
+        )
+        for row in db.execute(
+            select(ranked.c.id, ranked.c.title, ranked.c.status, ranked.c.assigned_to_id, ranked.c.project_id)
+            .where(ranked.c.rank <= recent)
+            .order_by(ranked.c.project_id, ranked.c.rank)
+        ):
+            recent_tasks[row.project_id].append({
+                "id": row.id,
+                "title": row.title,
+                "status": row.status,
+                "assigned_to_id": row.assigned_to_id,
+            })
+
+    # Distinct members across all visible projects (people in several projects count once)
+    total_members = (
+        db.query(func.count(distinct(team_members.c.user_id)))
+        .join(Team, Team.id == team_members.c.team_id)
+        .filter(Team.project_id.in_(project_ids))
+        .scalar()
+    )
+
+    summaries = []
+    totals_by_status = {status.value: 0 for status in TaskStatus}
+    for project_id, name, description, status, owner_id in projects:
+        by_status = {status.value: 0 for status in TaskStatus}
+        by_status.update(task_counts.get(project_id, {}))
+        for key, count in by_status.items():
+            totals_by_status[key] = totals_by_status.get(key, 0) + count
+        teams, members = team_counts.get(project_id, (0, 0))
+        summaries.append({
+            "id": project_id,
+            "name": name,
+            "description": description,
+            "status": status,
+            "owner_id": owner_id,
+            "tasks": sum(by_status.values()),
+            "tasks_by_status": by_status,
+            "teams": teams,
+            "members": members,
+            "recent_tasks": recent_tasks.get(project_id, []),
+        })
+
+    return {
+        "totals": {
+            "projects": len(summaries),
+            "tasks": sum(totals_by_status.values()),
+            "tasks_by_status": totals_by_status,
+            "teams": sum(s["teams"] for s in summaries),
+            "members": total_members or 0,
+        },
+        "projects": summaries,
+    }
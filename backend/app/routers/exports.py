@@ -0,0 +1,127 @@
+import csv
+import enum
+import io
+import os
+from typing import Iterator, List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.project_schema import ProjectResponse
+from app.schemas.task_schema import TaskResponse
+from app.schemas.user_schema import UserResponse
+from app.utils.fast_json import response_columns, select_fields
+from app.utils.role_checker import get_current_user, require_role, visible_project_ids
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+# Rows fetched per server-side cursor batch and written per response chunk
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "2000"))
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+# ----------------- ENCODERS -----------------
+def _csv_value(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _encode_ndjson(keys: List[str], rows) -> bytes:
+    return b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(v) for v in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_rows(statement, keys: List[str], fmt: str, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Run `statement` on its own session with a server-side cursor and yield
+    the encoded rows chunk by chunk, so memory stays flat for any table size.
+    Sync generator: Starlette iterates it in the threadpool.
+    """
+    if fmt == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(keys)
+        yield header.getvalue().encode("utf-8")
+
+    # The request's session is closed independently of the response body
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=chunk_rows))
+        for rows in result.partitions():
+            yield _encode_ndjson(keys, rows) if fmt == "ndjson" else _encode_csv(rows)
+    finally:
+        db.close()
+
+
+def export_response(statement, keys: List[str], fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(statement, keys, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+def _check_format(fmt: str) -> str:
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}",
+        )
+    return fmt
+
+
+# ---------------- EXPORT TASKS ----------------
+@router.get("/tasks")
+def export_tasks(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated TaskResponse fields to export"),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream every task the caller can see (same scoping as GET /tasks/)."""
+    fmt = _check_format(format)
+    names = select_fields(TaskResponse, fields)
+    statement = select(*response_columns(TaskResponse, Task, names)).order_by(Task.id)
+    if current_user.role != "admin":
+        statement = statement.where(Task.project_id.in_(visible_project_ids(current_user)))
+    return export_response(statement, names, fmt, "tasks")
+
+
+# ---------------- EXPORT PROJECTS ----------------
+@router.get("/projects")
+def export_projects(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated ProjectResponse fields to export"),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream every project the caller can see (same scoping as GET /projects/)."""
+    fmt = _check_format(format)
+    names = select_fields(ProjectResponse, fields)
+    statement = select(*response_columns(ProjectResponse, Project, names)).order_by(Project.id)
+    if current_user.role != "admin":
+        statement = statement.where(Project.id.in_(visible_project_ids(current_user)))
+    return export_response(statement, names, fmt, "projects")
+
+
+# ---------------- EXPORT USERS (ADMIN ONLY) ----------------
+@router.get("/users", dependencies=[Depends(require_role("admin"))])
+def export_users(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated UserResponse fields to export"),
+):
+    fmt = _check_format(format)
+    names = select_fields(UserResponse, fields)
+    statement = select(*response_columns(UserResponse, User, names)).order_by(User.id)
+    return export_response(statement, names, fmt, "users")
@@ -0,0 +1,70 @@
+import os
+import secrets
+
+from anyio import to_thread
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.db_instrumentation import pool_wait
+from app.services.email_service import email_transport
+from app.services.metrics import (
+    DB_POOL_WAIT_AVERAGE,
+    EMAIL_IN_FLIGHT,
+    EMAIL_QUEUE_DEPTH,
+    THREADPOOL_BUSY,
+    THREADPOOL_MAX,
+    THREADPOOL_WAITING,
+    WS_CONNECTIONS,
+    registry,
+)
+from app.services.websocket_manager import manager
+
+# Optional shared secret for scrapers: "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+router = APIRouter(tags=["metrics"])
+
+
+# ----------------- COLLECTORS -----------------
+def collect_threadpool():
+    limiter = to_thread.current_default_thread_limiter()
+    stats = limiter.statistics()
+    THREADPOOL_BUSY.set(stats.borrowed_tokens)
+    THREADPOOL_MAX.set(stats.total_tokens)
+    THREADPOOL_WAITING.set(stats.tasks_waiting)
+
+
+def collect_websockets():
+    WS_CONNECTIONS.clear()
+    for project_id, connections in list(manager.active_connections.items()):
+        if connections:
+            WS_CONNECTIONS.set(len(connections), project_id=project_id)
+
+
+def collect_email_queue():
+    EMAIL_QUEUE_DEPTH.set(email_transport.queued)
+    EMAIL_IN_FLIGHT.set(email_transport.in_flight)
+
+
+def collect_pool_wait():
+    DB_POOL_WAIT_AVERAGE.set(pool_wait.value())
+
+
+registry.add_collector(collect_threadpool)
+registry.add_collector(collect_websockets)
+registry.add_collector(collect_email_queue)
+registry.add_collector(collect_pool_wait)
+
+
+# ----------------- ENDPOINT -----------------
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    """
+    Expose process metrics in the Prometheus text format.
+    """
+    if METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        if not secrets.compare_digest(supplied, METRICS_TOKEN):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
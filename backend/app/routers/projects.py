@@ -1,16 +1,31 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select
 import asyncio
 
-from app.core.database import get_db
+from app.core.database import get_db, get_mutation_db
 from app.models.project import Project, ProjectStatus
 from app.models.task import Task, TaskStatus
 from app.models.team import Team, team_members
 from app.models.user import User
-from app.schemas.project_schema import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.schemas.task_schema import TaskResponse
+from app.schemas.project_schema import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectDetailResponse
 from app.utils.role_checker import get_current_user, require_role
+from app.utils.fast_json import encode_rows, response_columns, select_fields
 from app.services.websocket_manager import manager
+from app.services.response_cache import json_body_response, response_cache
+from app.services.counter_service import apply_counter_deltas, status_key
+from app.services.versioning import (
+    PROJECTS_SCOPE,
+    bump_versions,
+    make_etag,
+    not_modified,
+    project_scope,
+    set_etag,
+    user_scope,
+    versions_token,
+)
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -23,7 +38,7 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 )
 async def create_project(
     payload: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user),
 ) -> Project:
     """Admin creates a project and optionally assigns an owner."""
@@ -40,8 +55,9 @@ async def create_project(
         status=ProjectStatus.active,
     )
     db.add(project)
+    db.flush()
+    bump_versions(db, PROJECTS_SCOPE, project_scope(project.id))
     db.commit()
-    db.refresh(project)
 
     # WebSocket broadcast: project created
     await manager.broadcast(project.id, {
@@ -57,22 +73,43 @@ async def create_project(
 # ---------------- READ ALL PROJECTS ----------------
 @router.get("/", response_model=List[ProjectResponse])
 def list_projects(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated ProjectResponse fields to return"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ) -> List[Project]:
     """List projects based on user role."""
-    if current_user.role == "admin":
-        return db.query(Project).all()
-    if current_user.role == "owner":
-        return db.query(Project).filter(Project.owner_id == current_user.id).all()
-
-    # member: only projects where user is in a team
-    return (
-        db.query(Project)
-        .join(Team, Team.project_id == Project.id)
-        .join(team_members, team_members.c.team_id == Team.id)
-        .filter(team_members.c.user_id == current_user.id)
-        .all()
-    )
+    names = select_fields(ProjectResponse, fields)
+
+    # Conditional GET: members also depend on their own team memberships
+    scopes = [PROJECTS_SCOPE]
+    if current_user.role not in ("admin", "owner"):
+        scopes.append(user_scope(current_user.id))
+    token = versions_token(db, scopes)
+    etag = make_etag(token, current_user.role, current_user.id, *names)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+
+    def build() -> bytes:
+        columns = response_columns(ProjectResponse, Project, names)
+        query = db.query(*columns)
+
+        if current_user.role == "owner":
+            query = query.filter(Project.owner_id == current_user.id)
+        elif current_user.role != "admin":
+            # member: only projects where user is in a team
+            query = query.filter(Project.id.in_(
+                select(Team.project_id)
+                .join(team_members, team_members.c.team_id == Team.id)
+                .where(team_members.c.user_id == current_user.id)
+            ))
+        return encode_rows(query.all(), names)
+
+    # Admins all share one entry; owners and members are keyed per user
+    principal = "admin" if current_user.role == "admin" else f"{current_user.role}:{current_user.id}"
+    body = response_cache.get_or_build("projects.list", (principal, token, *names), scopes, build)
+    return set_etag(json_body_response(body), etag)
 
 
 # ---------------- READ OTHER PROJECTS (FOR COLLABORATION) ----------------
@@ -118,12 +155,92 @@ def get_project(
     raise HTTPException(status_code=403, detail="Not authorized to view this project")
 
 
+# ---------------- PROJECT DETAIL (FOR OWNERS) ----------------
+@router.get("/{project_id}/detail", response_model=ProjectDetailResponse)
+def get_project_detail(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Project, tasks, teams, member details and available users in one call.
+    Authorizes once and runs a fixed number of queries regardless of size.
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Same access rule as the per-resource owner endpoints
+    if current_user.role == "owner" and project.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this project")
+    elif current_user.role not in ["admin", "owner"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    task_columns = response_columns(TaskResponse, Task)
+    task_keys = [column.key for column in task_columns]
+    tasks = [
+        dict(zip(task_keys, row))
+        for row in db.query(*task_columns).filter(Task.project_id == project_id).order_by(Task.id)
+    ]
+
+    teams = [
+        {"id": team_id, "name": name, "project_id": project_id, "owner_id": owner_id, "member_ids": []}
+        for team_id, name, owner_id in (
+            db.query(Team.id, Team.name, Team.owner_id).filter(Team.project_id == project_id).order_by(Team.id)
+        )
+    ]
+    teams_by_id = {team["id"]: team for team in teams}
+
+    # One join for every membership in the project
+    members = []
+    memberships = (
+        db.query(team_members.c.team_id, User.id, User.name, User.email, User.role)
+        .join(User, User.id == team_members.c.user_id)
+        .join(Team, Team.id == team_members.c.team_id)
+        .filter(Team.project_id == project_id)
+        .order_by(team_members.c.team_id, User.id)
+    )
+    for team_id, user_id, name, email, role in memberships:
+        team = teams_by_id[team_id]
+        team["member_ids"].append(user_id)
+        members.append({
+            "id": user_id,
+            "name": name,
+            "email": email,
+            "role": role,
+            "team_id": team_id,
+            "team_name": team["name"],
+        })
+
+    project_member_ids = (
+        select(team_members.c.user_id)
+        .join(Team, Team.id == team_members.c.team_id)
+        .where(Team.project_id == project_id)
+    )
+    available_users = [
+        {"id": user_id, "name": name, "email": email}
+        for user_id, name, email in (
+            db.query(User.id, User.name, User.email)
+            .filter(User.role == "member", User.id.notin_(project_member_ids))
+            .order_by(User.id)
+        )
+    ]
+
+    return {
+        "project": project,
+        "tasks": tasks,
+        "teams": teams,
+        "members": members,
+        "available_users": available_users,
+    }
+
+
 # ---------------- UPDATE PROJECT ----------------
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
     payload: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user),
 ) -> Project:
     """Update project details. Only admin can update all fields."""
@@ -144,6 +261,7 @@ async def update_project(
             tasks: List[Task] = db.query(Task).filter(Task.project_id == project.id).all()
             for t in tasks:
                 t.status = TaskStatus.incomplete
+                t.version = Task.version + 1  # invalidates If-Match tags held by clients
 
     if payload.owner_id is not None:
         owner = db.query(User).filter(User.id == payload.owner_id, User.role == "owner").first()
@@ -151,8 +269,8 @@ async def update_project(
             raise HTTPException(status_code=400, detail="Invalid owner_id")
         project.owner_id = payload.owner_id
 
+    bump_versions(db, PROJECTS_SCOPE, project_scope(project.id))
     db.commit()
-    db.refresh(project)
 
     # WebSocket broadcast: project updated
     await manager.broadcast(project.id, {
@@ -169,7 +287,7 @@ async def update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_200_OK)
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user),
 ) -> dict:
     """Delete a project and all related tasks and teams. Admin only."""
@@ -180,11 +298,26 @@ async def delete_project(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to delete project")
 
+    # Bulk deletes bypass the ORM flush, so adjust the metric counters here
+    deltas = {}
+    task_counts = (
+        db.query(Task.status, func.count(Task.id))
+        .filter(Task.project_id == project.id)
+        .group_by(Task.status)
+        .all()
+    )
+    for task_status, count in task_counts:
+        deltas["tasks"] = deltas.get("tasks", 0) - count
+        if task_status is not None:
+            deltas[status_key("tasks.status", task_status)] = -count
+
     # Delete related tasks and teams
     db.query(Task).filter(Task.project_id == project.id).delete(synchronize_session=False)
-    db.query(Team).filter(Team.project_id == project.id).delete(synchronize_session=False)
+    deltas["teams"] = -db.query(Team).filter(Team.project_id == project.id).delete(synchronize_session=False)
+    apply_counter_deltas(db.connection(), deltas)
 
     db.delete(project)
+    bump_versions(db, PROJECTS_SCOPE, project_scope(project.id))
     db.commit()
 
     # WebSocket broadcast: project deleted
@@ -1,18 +1,25 @@
 # src/routers/tasks.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, BackgroundTasks
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select, true
 
-from app.core.database import get_db
+from app.core.database import get_db, get_mutation_db
 from app.models.task import Task, TaskStatus
 from app.models.user import User
 from app.models.project import Project
 from app.models.team import Team, team_members
 from app.schemas.task_schema import TaskCreate, TaskUpdate, TaskResponse, TaskStatusUpdate
 from app.utils.role_checker import get_current_user
-from app.services.email_service import send_task_assigned_email, send_task_status_update_email
+from app.utils.fast_json import encode_rows, response_columns, rows_response, select_fields
+from app.services.email_service import notify_task_assigned, notify_task_status_updated
+from app.services.notification_service import build_task_notification, resolve_task_notification
+from app.services.task_updates import task_etag, update_task_row
 from app.services.websocket_manager import manager
+from app.services.response_cache import json_body_response, response_cache
+from app.services.versioning import (
+    bump_versions, if_match_versions, make_etag, not_modified, project_scope, set_etag, versions_token,
+)
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -30,30 +37,13 @@ def verify_permission(user: User, project: Project, action: str):
     raise HTTPException(status_code=403, detail="Not authorized for this action")
 
 
-def gather_recipients(db: Session, task: Task):
-    """
-    Collect all emails that should be notified about a task.
-    """
-    recipients = set()
-    assigned_user = db.query(User).filter(User.id == task.assigned_to_id).first()
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    owner = db.query(User).filter(User.id == project.owner_id).first()
-    admins = db.query(User).filter(User.role == "admin").all()
-
-    if assigned_user and assigned_user.email:
-        recipients.add(assigned_user.email)
-    if owner and owner.email:
-        recipients.add(owner.email)
-    recipients.update([a.email for a in admins if a.email])
-
-    return recipients
-
 # ---------------- CREATE TASK ----------------
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     payload: TaskCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user)
 ):
     project = db.query(Project).filter(Project.id == payload.project_id).first()
@@ -70,19 +60,18 @@ async def create_task(
         assigned_to_id=payload.assigned_to_id,
     )
     db.add(task)
+    bump_versions(db, project_scope(task.project_id))
     db.commit()
-    db.refresh(task)
 
     # Send emails asynchronously
-    recipients = gather_recipients(db, task)
-    for r in recipients:
-        background_tasks.add_task(
-            send_task_assigned_email,
-            member_email=r,
-            project_name=project.name,
-            task_title=task.title,
-            assigned_by=current_user.name
-        )
+    notification = resolve_task_notification(db, task.id)
+    background_tasks.add_task(
+        notify_task_assigned,
+        recipients=list(notification.recipients),
+        project_name=notification.project_name,
+        task_title=task.title,
+        assigned_by=current_user.name
+    )
 
     # WebSocket Broadcast
     await manager.broadcast(project.id, {
@@ -93,31 +82,40 @@ async def create_task(
         "status": task.status.value
     })
 
+    response.headers["ETag"] = task_etag(task.id, task.version)
     return task
 
 # ---------------- GET ALL TASKS ----------------
 @router.get("/", response_model=List[TaskResponse])
 async def get_all_tasks(
+    fields: Optional[str] = Query(None, description="Comma-separated TaskResponse fields to return"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = db.query(Task)
+    # Fast path: select only the requested response columns and encode the tuples directly
+    columns = response_columns(TaskResponse, Task, select_fields(TaskResponse, fields))
+    query = db.query(*columns)
 
     if current_user.role == "owner":
-        query = query.join(Project).filter(Project.owner_id == current_user.id)
+        query = query.filter(Task.project_id.in_(select(Project.id).where(Project.owner_id == current_user.id)))
     elif current_user.role == "member":
-        query = query.join(Project, Task.project_id == Project.id)\
-                     .join(Team, Team.project_id == Project.id)\
-                     .join(team_members, team_members.c.team_id == Team.id)\
-                     .filter(team_members.c.user_id == current_user.id)
+        # Subquery rather than join + DISTINCT, which would merge rows once fields are narrowed
+        member_projects = (
+            select(Team.project_id)
+            .join(team_members, team_members.c.team_id == Team.id)
+            .where(team_members.c.user_id == current_user.id)
+        )
+        query = query.filter(Task.project_id.in_(member_projects))
 
-    return query.all()
+    return rows_response(query, columns)
 
 
 # ---------------- GET PROJECT TASKS (FOR OWNERS) ----------------
 @router.get("/project/{project_id}", response_model=List[TaskResponse])
-async def get_project_tasks(
+def get_project_tasks(
     project_id: int,
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated TaskResponse fields to return"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -131,16 +129,40 @@ async def get_project_tasks(
         raise HTTPException(status_code=403, detail="Not authorized to view this project's tasks")
     elif current_user.role not in ["admin", "owner"]:
         raise HTTPException(status_code=403, detail="Not authorized")
-    
-    return db.query(Task).filter(Task.project_id == project_id).all()
+
+    names = select_fields(TaskResponse, fields)
+
+    # Conditional GET: skip the list query when the client is up to date
+    scopes = [project_scope(project_id)]
+    token = versions_token(db, scopes)
+    etag = make_etag(token, *names)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+
+    def build() -> bytes:
+        columns = response_columns(TaskResponse, Task, names)
+        rows = db.query(*columns).filter(Task.project_id == project_id).all()
+        return encode_rows(rows, names)
+
+    body = response_cache.get_or_build("tasks.project_tasks", (project_id, token, *names), scopes, build)
+    return set_etag(json_body_response(body), etag)
 
 # ---------------- GET SINGLE TASK ----------------
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_task(
+    task_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    # Send back as If-Match to update this exact version
+    response.headers["ETag"] = task_etag(task.id, task.version)
+
     # Role-based access
     if current_user.role == "admin":
         return task
@@ -164,33 +186,35 @@ async def get_task(task_id: int, db: Session = Depends(get_db), current_user: Us
 async def update_task(
     task_id: int,
     payload: TaskUpdate,
+    request: Request,
+    response: Response,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    verify_permission(current_user, task.project, "manage")
+    # Same rule as verify_permission(..., "manage"), evaluated by the UPDATE itself
+    if current_user.role == "admin":
+        permitted = true()
+    else:
+        permitted = Task.project_id.in_(select(Project.id).where(Project.owner_id == current_user.id))
 
-    for key, value in payload.dict(exclude_unset=True).items():
-        setattr(task, key, value)
+    values = payload.dict(exclude_unset=True)
+    if values.get("status") is not None:
+        values["status"] = TaskStatus(values["status"])
 
+    task = update_task_row(db, task_id, values, permitted, if_match_versions(request, "task", task_id))
     db.commit()
-    db.refresh(task)
 
     # Emails
-    recipients = gather_recipients(db, task)
-    for r in recipients:
-        background_tasks.add_task(
-            send_task_status_update_email,
-            recipients=[r],
-            project_name=task.project.name,
-            task_title=task.title,
-            new_status=task.status.value,
-            updated_by=current_user.name
-        )
+    notification = build_task_notification(db, task.project_name, task.owner_email, task.assignee_email)
+    background_tasks.add_task(
+        notify_task_status_updated,
+        recipients=list(notification.recipients),
+        project_name=notification.project_name,
+        task_title=task.title,
+        new_status=task.status.value if task.status else None,
+        updated_by=current_user.name
+    )
 
     # WebSocket
     await manager.broadcast(task.project_id, {
@@ -198,16 +222,18 @@ async def update_task(
         "task_id": task.id,
         "title": task.title,
         "assigned_to": task.assigned_to_id,
-        "status": task.status.value
+        "status": task.status.value if task.status else None,
+        "version": task.version
     })
 
+    response.headers["ETag"] = task_etag(task.id, task.version)
     return task
 
 # ---------------- DELETE TASK ----------------
 @router.delete("/{task_id}", status_code=status.HTTP_200_OK)
 async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user)
 ):
     task = db.query(Task).filter(Task.id == task_id).first()
@@ -217,6 +243,7 @@ async def delete_task(
     verify_permission(current_user, task.project, "manage")
 
     db.delete(task)
+    bump_versions(db, project_scope(task.project_id))
     db.commit()
 
     await manager.broadcast(task.project_id, {
@@ -231,37 +258,37 @@ async def delete_task(
 async def update_task_status(
     task_id: int,
     payload: TaskStatusUpdate,
+    request: Request,
+    response: Response,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    if current_user.role == "member" and task.assigned_to_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this task")
+    # Members may only move tasks assigned to them
+    permitted = Task.assigned_to_id == current_user.id if current_user.role == "member" else true()
 
-    task.status = payload.status
+    task = update_task_row(
+        db, task_id, {"status": TaskStatus(payload.status)}, permitted, if_match_versions(request, "task", task_id),
+    )
     db.commit()
-    db.refresh(task)
-
-    recipients = gather_recipients(db, task)
-    for r in recipients:
-        background_tasks.add_task(
-            send_task_status_update_email,
-            recipients=[r],
-            project_name=task.project.name,
-            task_title=task.title,
-            new_status=task.status.value,
-            updated_by=current_user.name
-        )
+
+    notification = build_task_notification(db, task.project_name, task.owner_email, task.assignee_email)
+    background_tasks.add_task(
+        notify_task_status_updated,
+        recipients=list(notification.recipients),
+        project_name=notification.project_name,
+        task_title=task.title,
+        new_status=task.status.value,
+        updated_by=current_user.name
+    )
 
     await manager.broadcast(task.project_id, {
         "event": "task_status_updated",
         "task_id": task.id,
         "status": task.status.value,
-        "updated_by": current_user.name
+        "updated_by": current_user.name,
+        "version": task.version
     })
 
+    response.headers["ETag"] = task_etag(task.id, task.version)
     return task
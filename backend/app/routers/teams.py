@@ -1,15 +1,29 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 import asyncio
+import orjson
 
-from app.core.database import get_db
+from app.core.database import get_db, get_mutation_db
 from app.models.team import Team, team_members
 from app.models.project import Project
 from app.models.user import User
 from app.schemas.team_schema import TeamCreate, AddMember, RemoveMember, TeamResponse
 from app.utils.role_checker import get_current_user
+from app.utils.fast_json import RowsJSONResponse, select_fields
 from app.services.websocket_manager import manager
+from app.services.response_cache import json_body_response, response_cache
+from app.services.versioning import (
+    USERS_SCOPE,
+    bump_versions,
+    make_etag,
+    not_modified,
+    project_scope,
+    set_etag,
+    user_scope,
+    versions_token,
+)
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
@@ -17,7 +31,7 @@ router = APIRouter(prefix="/teams", tags=["teams"])
 @router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
 async def create_team(
     payload: TeamCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user),
 ) -> Team:
     if current_user.role not in ["admin", "owner"]:
@@ -26,9 +40,6 @@ async def create_team(
     owner_id = payload.owner_id if current_user.role == "admin" else current_user.id
 
     team = Team(name=payload.name, project_id=payload.project_id, owner_id=owner_id)
-    db.add(team)
-    db.commit()
-    db.refresh(team)
 
     # Collect initial member ids, ensure owner(s) are included
     initial_member_ids = set(payload.member_ids or [])
@@ -42,13 +53,12 @@ async def create_team(
     if payload.owner_id:
         initial_member_ids.add(payload.owner_id)
 
-    if initial_member_ids:
-        users = db.query(User).filter(User.id.in_(list(initial_member_ids))).all()
-        for user in users:
-            if user not in team.members:
-                team.members.append(user)
-        db.commit()
-        db.refresh(team)
+    # A new team has no members yet: assign the collection instead of loading it
+    team.members = db.query(User).filter(User.id.in_(list(initial_member_ids))).all() if initial_member_ids else []
+    db.add(team)
+
+    bump_versions(db, project_scope(team.project_id), *(user_scope(uid) for uid in initial_member_ids))
+    db.commit()
 
     # WebSocket broadcast: team created
     await manager.broadcast(team.project_id, {
@@ -65,7 +75,7 @@ async def create_team(
 @router.post("/add_member", status_code=status.HTTP_200_OK)
 async def add_member(
     payload: AddMember,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user),
 ) -> dict:
     if current_user.role not in ["admin", "owner"]:
@@ -83,6 +93,7 @@ async def add_member(
         raise HTTPException(status_code=400, detail="User already in team")
 
     team.members.append(user)
+    bump_versions(db, project_scope(team.project_id), user_scope(user.id))
     db.commit()
 
     # WebSocket broadcast: member added
@@ -100,7 +111,7 @@ async def add_member(
 @router.post("/remove_member", status_code=status.HTTP_200_OK)
 async def remove_member(
     payload: RemoveMember,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     current_user: User = Depends(get_current_user),
 ) -> dict:
     if current_user.role not in ["admin", "owner"]:
@@ -115,6 +126,7 @@ async def remove_member(
         raise HTTPException(status_code=404, detail="User not found in team")
 
     team.members.remove(user)
+    bump_versions(db, project_scope(team.project_id), user_scope(user.id))
     db.commit()
 
     # WebSocket broadcast: member removed
@@ -131,37 +143,44 @@ async def remove_member(
 # ---------------- LIST TEAMS ----------------
 @router.get("/", response_model=List[TeamResponse])
 def list_teams(
+    fields: Optional[str] = Query(None, description="Comma-separated TeamResponse fields to return"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> List[Team]:
-    def serialize(team: Team) -> TeamResponse:
-        return TeamResponse(
-            id=team.id,
-            name=team.name,
-            project_id=team.project_id,
-            owner_id=team.owner_id,
-            member_ids=[m.id for m in team.members],
-        )
+    names = select_fields(TeamResponse, fields)
 
     if current_user.role == "admin":
-        teams = db.query(Team).all()
-        return [serialize(t) for t in teams]
-    if current_user.role == "owner":
-        teams = db.query(Team).filter(Team.owner_id == current_user.id).all()
-        return [serialize(t) for t in teams]
-    teams = (
-        db.query(Team)
-        .join(team_members, team_members.c.team_id == Team.id)
-        .filter(team_members.c.user_id == current_user.id)
-        .all()
-    )
-    return [serialize(t) for t in teams]
+        team_ids = select(Team.id)
+    elif current_user.role == "owner":
+        team_ids = select(Team.id).where(Team.owner_id == current_user.id)
+    else:
+        team_ids = select(team_members.c.team_id).where(team_members.c.user_id == current_user.id)
+
+    columns = [getattr(Team, name) for name in names if name != "member_ids"]
+    rows = db.query(Team.id, *columns).filter(Team.id.in_(team_ids)).order_by(Team.id).all()
+
+    # Member ids for every listed team in one query instead of one per team
+    member_ids = {}
+    if "member_ids" in names:
+        for team_id, user_id in db.query(team_members.c.team_id, team_members.c.user_id).filter(
+            team_members.c.team_id.in_(team_ids)
+        ):
+            member_ids.setdefault(team_id, []).append(user_id)
+
+    keys = [column.key for column in columns]
+    items = []
+    for team_id, *values in rows:
+        item = dict(zip(keys, values))
+        item["member_ids"] = member_ids.get(team_id, [])
+        items.append([item[name] for name in names])
+    return RowsJSONResponse(items, names)
 
 
 # ---------------- GET PROJECT TEAMS (FOR OWNERS) ----------------
 @router.get("/project/{project_id}", response_model=List[TeamResponse])
 def get_project_teams(
     project_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> List[Team]:
@@ -175,7 +194,15 @@ def get_project_teams(
         raise HTTPException(status_code=403, detail="Not authorized to view this project's teams")
     elif current_user.role not in ["admin", "owner"]:
         raise HTTPException(status_code=403, detail="Not authorized")
-    
+
+    # Conditional GET: skip the list query when the client is up to date
+    scopes = [project_scope(project_id)]
+    token = versions_token(db, scopes)
+    etag = make_etag(token)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+
     def serialize(team: Team) -> TeamResponse:
         return TeamResponse(
             id=team.id,
@@ -184,15 +211,20 @@ def get_project_teams(
             owner_id=team.owner_id,
             member_ids=[m.id for m in team.members],
         )
-    
-    teams = db.query(Team).filter(Team.project_id == project_id).all()
-    return [serialize(t) for t in teams]
+
+    def build() -> bytes:
+        teams = db.query(Team).options(selectinload(Team.members)).filter(Team.project_id == project_id).all()
+        return orjson.dumps([serialize(t).model_dump() for t in teams])
+
+    body = response_cache.get_or_build("teams.project_teams", (project_id, token), scopes, build)
+    return set_etag(json_body_response(body), etag)
 
 
 # ---------------- GET PROJECT MEMBERS (FOR OWNERS) ----------------
 @router.get("/project/{project_id}/members", response_model=List[dict])
 def get_project_members(
     project_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -206,23 +238,34 @@ def get_project_members(
         raise HTTPException(status_code=403, detail="Not authorized to view this project's members")
     elif current_user.role not in ["admin", "owner"]:
         raise HTTPException(status_code=403, detail="Not authorized")
-    
-    # Get all teams in this project
-    teams = db.query(Team).filter(Team.project_id == project_id).all()
-    
-    members = []
-    for team in teams:
-        for member in team.members:
-            members.append({
-                "id": member.id,
-                "name": member.name,
-                "email": member.email,
-                "role": member.role,
-                "team_id": team.id,
-                "team_name": team.name
-            })
-    
-    return members
+
+    # Member details include names and roles, so user changes matter too
+    scopes = [project_scope(project_id), USERS_SCOPE]
+    token = versions_token(db, scopes)
+    etag = make_etag(token)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+
+    def build() -> bytes:
+        # Get all teams in this project
+        teams = db.query(Team).options(selectinload(Team.members)).filter(Team.project_id == project_id).all()
+
+        members = []
+        for team in teams:
+            for member in team.members:
+                members.append({
+                    "id": member.id,
+                    "name": member.name,
+                    "email": member.email,
+                    "role": member.role,
+                    "team_id": team.id,
+                    "team_name": team.name
+                })
+        return orjson.dumps(members)
+
+    body = response_cache.get_or_build("teams.project_members", (project_id, token), scopes, build)
+    return set_etag(json_body_response(body), etag)
 
 
 # ---------------- GET AVAILABLE USERS (FOR OWNERS) ----------------
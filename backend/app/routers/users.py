@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 
 from app.models.user import User
 from app.schemas.user_schema import UserResponse, UserRoleUpdate, UserStatusUpdate
 from app.utils.role_checker import get_current_user, require_role
-from app.core.database import get_db
+from app.core.database import get_db, get_mutation_db
+from app.utils.fast_json import response_columns, rows_response, select_fields
+from app.services.notification_service import invalidate_admin_emails
+from app.services.versioning import USERS_SCOPE, bump_versions
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -48,20 +51,28 @@ def member_only(user: User = Depends(get_current_user)) -> dict:
 
 # ---------------- LIST ALL USERS (ADMIN ONLY) ----------------
 @router.get("/", response_model=List[UserResponse], dependencies=[Depends(require_role("admin"))])
-def list_users(db: Session = Depends(get_db)) -> List[User]:
+def list_users(
+    fields: Optional[str] = Query(None, description="Comma-separated UserResponse fields to return"),
+    db: Session = Depends(get_db),
+) -> List[User]:
     """
     List all users in the system (admin only).
     """
-    return db.query(User).all()
+    columns = response_columns(UserResponse, User, select_fields(UserResponse, fields))
+    return rows_response(db.query(*columns), columns)
 
 
 # ---------------- LIST USERS FOR OWNERS ----------------
 @router.get("/members", response_model=List[UserResponse], dependencies=[Depends(require_role("owner"))])
-def list_member_users(db: Session = Depends(get_db)) -> List[User]:
+def list_member_users(
+    fields: Optional[str] = Query(None, description="Comma-separated UserResponse fields to return"),
+    db: Session = Depends(get_db),
+) -> List[User]:
     """
     List all member users for owners to assign tasks.
     """
-    return db.query(User).filter(User.role == "member").all()
+    columns = response_columns(UserResponse, User, select_fields(UserResponse, fields))
+    return rows_response(db.query(*columns).filter(User.role == "member"), columns)
 
 
 # ---------------- UPDATE USER ROLE (ADMIN ONLY) ----------------
@@ -69,7 +80,7 @@ def list_member_users(db: Session = Depends(get_db)) -> List[User]:
 def update_user_role(
     user_id: int,
     payload: UserRoleUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     _: User = Depends(get_current_user)
 ) -> User:
     user = db.query(User).filter(User.id == user_id).first()
@@ -86,8 +97,9 @@ def update_user_role(
         if not another_admin:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot remove the only admin")
     user.role = payload.role
+    bump_versions(db, USERS_SCOPE)
     db.commit()
-    db.refresh(user)
+    invalidate_admin_emails()
     return user
 
 
@@ -96,13 +108,13 @@ def update_user_role(
 def update_user_status(
     user_id: int,
     payload: UserStatusUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_mutation_db),
     _: User = Depends(get_current_user)
 ) -> User:
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     user.is_active = payload.is_active
+    bump_versions(db, USERS_SCOPE)
     db.commit()
-    db.refresh(user)
     return user
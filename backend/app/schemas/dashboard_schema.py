@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from app.models.project import ProjectStatus
+from app.schemas.task_schema import TaskStatus
+
+
+# ---------------- RECENT ACTIVITY ----------------
+class RecentTask(BaseModel):
+    id: int
+    title: str
+    status: TaskStatus
+    assigned_to_id: Optional[int]
+
+
+# ---------------- PER PROJECT ----------------
+class ProjectSummary(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    status: ProjectStatus
+    owner_id: int
+    tasks: int
+    tasks_by_status: Dict[str, int]
+    teams: int
+    members: int
+    recent_tasks: List[RecentTask]
+
+
+# ---------------- RESPONSE ----------------
+class DashboardTotals(BaseModel):
+    projects: int
+    tasks: int
+    tasks_by_status: Dict[str, int]
+    teams: int
+    members: int
+
+
+class DashboardSummaryResponse(BaseModel):
+    totals: DashboardTotals
+    projects: List[ProjectSummary]
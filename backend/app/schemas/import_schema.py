@@ -0,0 +1,63 @@
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from typing import List, Literal, Optional
+from app.schemas.task_schema import TaskStatus
+
+
+# ---------------- USERS ----------------
+class UserImportRow(BaseModel):
+    name: str
+    email: EmailStr
+    password: Optional[str] = None
+    hashed_password: Optional[str] = None   # pre-hashed bcrypt, skips hashing
+    role: Literal["admin", "owner", "member"] = "member"
+    is_active: bool = True
+
+    @model_validator(mode="after")
+    def check_password(self):
+        if not self.password and not self.hashed_password:
+            raise ValueError("password or hashed_password is required")
+        if self.hashed_password and not self.hashed_password.startswith(("$2a$", "$2b$", "$2y$")):
+            raise ValueError("hashed_password must be a bcrypt hash")
+        return self
+
+
+# ---------------- TEAMS ----------------
+class TeamImportRow(BaseModel):
+    name: str
+    project_id: int
+    owner_id: Optional[int] = None         # defaults to the project owner
+    member_ids: List[int] = []
+
+    @field_validator("member_ids", mode="before")
+    @classmethod
+    def split_member_ids(cls, value):
+        # CSV cells carry ids as "1;2;3" (or space separated)
+        if isinstance(value, str):
+            return [part for part in value.replace(";", " ").replace(",", " ").split() if part]
+        return value
+
+
+# ---------------- TASKS ----------------
+class TaskImportRow(BaseModel):
+    title: str
+    description: Optional[str] = None
+    project_id: int
+    assigned_to_id: Optional[int] = None
+    status: TaskStatus = TaskStatus.in_progress
+
+
+# ---------------- RESPONSE ----------------
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    kind: str
+    processed: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+    seconds: float
+    rows_per_second: float
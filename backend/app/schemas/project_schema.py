@@ -1,6 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from app.models.project import ProjectStatus
+from app.schemas.task_schema import TaskResponse
+from app.schemas.team_schema import TeamResponse
 
 
 class ProjectCreate(BaseModel):
@@ -26,3 +28,28 @@ class ProjectResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# ---------------- PROJECT DETAIL ----------------
+class ProjectMemberResponse(BaseModel):
+    id: int
+    name: str
+    email: str
+    role: str
+    team_id: int
+    team_name: str
+
+
+class AvailableUserResponse(BaseModel):
+    id: int
+    name: str
+    email: str
+
+
+class ProjectDetailResponse(BaseModel):
+    """Everything the project detail page needs in one response."""
+    project: ProjectResponse
+    tasks: List[TaskResponse]
+    teams: List[TeamResponse]
+    members: List[ProjectMemberResponse]
+    available_users: List[AvailableUserResponse]
@@ -27,6 +27,7 @@ class TaskResponse(BaseModel):
     status: TaskStatus
     project_id: int
     assigned_to_id: Optional[int]
+    version: int
 
     class Config:
         from_attributes = True
@@ -0,0 +1,169 @@
+"""
+Production entrypoint: a pre-forking supervisor around uvicorn.
+
+The application is imported once in the supervisor and the listening socket
+is bound there; workers are forked from it, so they share the imported code
+copy-on-write and accept on the same socket. After fork each worker drops
+any inherited database pool (see `app.core.database`) and email client
+state, and opens its own on first use.
+
+SIGTERM / SIGINT to the supervisor stop every worker gracefully: uvicorn
+stops accepting, finishes in-flight requests (and their background email
+jobs), then the lifespan closes WebSockets and drains the email transport.
+Workers that do not exit within the grace period are killed. A worker that
+dies unexpectedly is replaced.
+
+    python -m app.server --workers 4 --host 0.0.0.0 --port 8000
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+
+logger = logging.getLogger("app.server")
+
+# Minimum seconds between restarts of a crashing worker slot
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--graceful-timeout", type=float, default=float(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30")),
+                        help="seconds a worker may take to finish requests and drain on shutdown")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    return parser.parse_args()
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int, graceful_timeout: float):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.children: Dict[int, float] = {}  # pid -> start time
+        self.should_exit = False
+
+    # ---------------- WORKERS ----------------
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+
+        # Worker: uvicorn installs its own SIGTERM / SIGINT handlers
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+            signal.signal(sig, signal.SIG_DFL)
+        code = 0
+        try:
+            uvicorn.Server(self.config).run(sockets=[self.sock])
+        except BaseException:
+            logger.exception("Worker crashed")
+            code = 1
+        finally:
+            os._exit(code)
+
+    def reap(self):
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            if started is not None and not self.should_exit:
+                code = os.waitstatus_to_exitcode(status)
+                logger.warning(f"Worker {pid} exited with {code}; replacing it")
+                time.sleep(max(0.0, RESPAWN_DELAY_SECONDS - (time.monotonic() - started)))
+
+    # ---------------- SIGNALS ----------------
+    def handle_exit(self, signum, frame):
+        self.should_exit = True
+
+    def stop_children(self):
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.children):
+            logger.warning(f"Worker {pid} did not stop in time; killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.children.clear()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.handle_exit)
+        signal.signal(signal.SIGINT, self.handle_exit)
+
+        # Everything imported so far is shared by the workers; keep the
+        # collector from touching (and so copying) those pages after fork
+        gc.freeze()
+        logger.info(f"Supervisor {os.getpid()} starting {self.workers} workers")
+        while not self.should_exit:
+            while len(self.children) < self.workers and not self.should_exit:
+                self.spawn()
+            self.reap()
+            time.sleep(0.2)
+
+        logger.info("Shutting down workers")
+        self.stop_children()
+        self.sock.close()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+
+    # Preload: import the application once, before forking
+    from app.main import app
+
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    if not hasattr(os, "fork"):
+        # No fork (Windows): a single in-process worker
+        uvicorn.Server(config).run()
+        return
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    Supervisor(config, sock, max(1, args.workers), args.graceful_timeout).run()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import csv
+import io
+import itertools
+import json
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.team import Team, team_members
+from app.models.user import User
+from app.schemas.import_schema import TaskImportRow, TeamImportRow, UserImportRow
+from app.services.counter_service import apply_counter_deltas, status_key
+from app.services.notification_service import invalidate_admin_emails
+from app.services.versioning import USERS_SCOPE, bump_versions, project_scope, user_scope
+from app.utils.auth_utils import hash_password
+from app.utils.db_utils import bulk_insert
+
+logger = logging.getLogger(__name__)
+
+# Rows validated, inserted and committed together
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+# bcrypt releases the GIL, so hashing scales with threads up to the core count
+IMPORT_HASH_WORKERS = int(os.getenv("IMPORT_HASH_WORKERS", str(os.cpu_count() or 4)))
+# Per-row errors kept in the report
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+_hash_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_hash_pool() -> ThreadPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(max_workers=IMPORT_HASH_WORKERS, thread_name_prefix="import-bcrypt")
+    return _hash_pool
+
+
+# ----------------- REPORT -----------------
+@dataclass
+class ImportReport:
+    kind: str
+    processed: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[Dict] = field(default_factory=list)
+    # Projects whose data changed, for one summary broadcast each
+    project_ids: Set[int] = field(default_factory=set)
+    started: float = field(default_factory=time.perf_counter)
+
+    def add_error(self, row: int, error: str):
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "error": error})
+
+    def as_dict(self) -> Dict:
+        seconds = time.perf_counter() - self.started
+        return {
+            "kind": self.kind,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(self.processed / seconds, 1) if seconds > 0 else 0.0,
+        }
+
+
+# ----------------- PARSING -----------------
+def read_rows(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Yield `(row_number, dict)` from an uploaded file without loading it whole.
+    Unparseable lines yield `(row_number, exception)`. Row numbers are 1-based
+    data rows (the CSV header is not counted).
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            # Empty cells mean "not provided", so schema defaults apply
+            yield number, {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, e
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _validate(batch, schema: Type[BaseModel], report: ImportReport) -> List[Tuple[int, BaseModel]]:
+    valid = []
+    for number, data in batch:
+        report.processed += 1
+        if isinstance(data, Exception):
+            report.add_error(number, f"Invalid JSON: {data}")
+            continue
+        if not isinstance(data, dict):
+            report.add_error(number, "Row must be an object")
+            continue
+        try:
+            valid.append((number, schema.model_validate(data)))
+        except ValidationError as e:
+            report.add_error(number, "; ".join(
+                f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+            ))
+    return valid
+
+
+def _existing_ids(db: Session, column, ids: Iterable[int]) -> Set[int]:
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(ids))))
+
+
+# ----------------- USERS -----------------
+def _import_users(db: Session, rows: List[Tuple[int, UserImportRow]], report: ImportReport, seen: Set[str]) -> int:
+    emails = {row.email.strip().lower() for _, row in rows}
+    taken = _existing_ids(db, User.email, emails)
+
+    accepted = []
+    for number, row in rows:
+        email = row.email.strip().lower()
+        if email in taken or email in seen:
+            report.add_error(number, f"Email already registered: {email}")
+            continue
+        seen.add(email)
+        accepted.append((email, row))
+    if not accepted:
+        return 0
+
+    # Hash only what needs hashing, in parallel
+    to_hash = [row.password for _, row in accepted if not row.hashed_password]
+    hashes = iter(_get_hash_pool().map(hash_password, to_hash)) if to_hash else iter(())
+    values = [
+        {
+            "name": row.name,
+            "email": email,
+            "hashed_password": row.hashed_password or next(hashes),
+            "role": row.role,
+            "is_active": row.is_active,
+        }
+        for email, row in accepted
+    ]
+
+    bulk_insert(db.connection(), User.__table__, values)
+    apply_counter_deltas(db.connection(), {"users": len(values)})
+    bump_versions(db, USERS_SCOPE)
+    if any(v["role"] == "admin" for v in values):
+        db.info["import_admin_added"] = True
+    return len(values)
+
+
+# ----------------- TEAMS -----------------
+def _import_teams(db: Session, rows: List[Tuple[int, TeamImportRow]], report: ImportReport, seen: Set[str]) -> int:
+    project_owners = dict(db.execute(
+        select(Project.id, Project.owner_id).where(Project.id.in_({row.project_id for _, row in rows}))
+    ).all())
+    referenced = {uid for _, row in rows for uid in [*row.member_ids, row.owner_id] if uid}
+    user_ids = _existing_ids(db, User.id, referenced)
+
+    accepted = []
+    for number, row in rows:
+        if row.project_id not in project_owners:
+            report.add_error(number, f"Project {row.project_id} not found")
+            continue
+        owner_id = row.owner_id or project_owners[row.project_id]
+        missing = sorted({uid for uid in [*row.member_ids, row.owner_id] if uid} - user_ids)
+        if missing:
+            report.add_error(number, f"Users not found: {', '.join(map(str, missing))}")
+            continue
+        # Same defaults as POST /teams/: project owner and team owner are members
+        members = set(row.member_ids) | {owner_id, project_owners[row.project_id]}
+        accepted.append((row, owner_id, sorted(members)))
+    if not accepted:
+        return 0
+
+    table = Team.__table__
+    team_ids = db.execute(
+        insert(table).returning(table.c.id, sort_by_parameter_order=True),
+        [{"name": row.name, "project_id": row.project_id, "owner_id": owner_id} for row, owner_id, _ in accepted],
+    ).scalars().all()
+
+    memberships = [
+        {"team_id": team_id, "user_id": user_id}
+        for team_id, (_, _, members) in zip(team_ids, accepted)
+        for user_id in members
+    ]
+    bulk_insert(db.connection(), team_members, memberships)
+
+    apply_counter_deltas(db.connection(), {"teams": len(team_ids)})
+    project_ids = {row.project_id for row, _, _ in accepted}
+    bump_versions(
+        db,
+        *(project_scope(pid) for pid in project_ids),
+        *(user_scope(m["user_id"]) for m in memberships),
+    )
+    report.project_ids.update(project_ids)
+    return len(team_ids)
+
+
+# ----------------- TASKS -----------------
+def _import_tasks(db: Session, rows: List[Tuple[int, TaskImportRow]], report: ImportReport, seen: Set[str]) -> int:
+    project_ids = _existing_ids(db, Project.id, (row.project_id for _, row in rows))
+    user_ids = _existing_ids(db, User.id, (row.assigned_to_id for _, row in rows if row.assigned_to_id))
+
+    values = []
+    for number, row in rows:
+        if row.project_id not in project_ids:
+            report.add_error(number, f"Project {row.project_id} not found")
+            continue
+        if row.assigned_to_id and row.assigned_to_id not in user_ids:
+            report.add_error(number, f"User {row.assigned_to_id} not found")
+            continue
+        values.append({
+            "title": row.title,
+            "description": row.description,
+            "status": TaskStatus(row.status.value),
+            "project_id": row.project_id,
+            "assigned_to_id": row.assigned_to_id,
+        })
+    if not values:
+        return 0
+
+    bulk_insert(db.connection(), Task.__table__, values)
+
+    deltas = Counter({"tasks": len(values)})
+    deltas.update(status_key("tasks.status", v["status"]) for v in values)
+    apply_counter_deltas(db.connection(), deltas)
+    touched = {v["project_id"] for v in values}
+    bump_versions(db, *(project_scope(pid) for pid in touched))
+    report.project_ids.update(touched)
+    return len(values)
+
+
+IMPORTERS: Dict[str, Tuple[Type[BaseModel], Callable]] = {
+    "users": (UserImportRow, _import_users),
+    "teams": (TeamImportRow, _import_teams),
+    "tasks": (TaskImportRow, _import_tasks),
+}
+
+
+# ----------------- PIPELINE -----------------
+def run_import(db: Session, kind: str, stream: IO[bytes], fmt: str, batch_size: int = IMPORT_BATCH_SIZE) -> ImportReport:
+    """
+    Stream, validate and insert rows batch by batch. Each batch is one
+    transaction; a batch the database rejects is rolled back and its rows
+    reported as failed while the rest of the file continues. Per-row emails
+    and broadcasts are skipped; the caller sends one summary per project.
+    """
+    schema, importer = IMPORTERS[kind]
+    report = ImportReport(kind=kind)
+    seen: Set[str] = set()
+
+    for batch in _batches(read_rows(stream, fmt), batch_size):
+        valid = _validate(batch, schema, report)
+        if not valid:
+            continue
+        failed_before, errors_before = report.failed, len(report.errors)
+        try:
+            inserted = importer(db, valid, report, seen)
+            db.commit()
+            report.inserted += inserted
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Import batch of {kind} rejected: {e}")
+            # Nothing from this batch was written: report every validated row
+            report.failed = failed_before
+            del report.errors[errors_before:]
+            for number, _ in valid:
+                report.add_error(number, f"Batch rejected by the database: {e.__class__.__name__}")
+
+    if db.info.pop("import_admin_added", False):
+        invalidate_admin_emails()
+    return report
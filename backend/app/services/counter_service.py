@@ -0,0 +1,100 @@
+import enum
+from collections import Counter
+from typing import Dict, Mapping
+
+from sqlalchemy import event, func, inspect, select, delete
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.metric_counter import MetricCounter
+from app.models.project import Project
+from app.models.task import Task
+from app.models.team import Team
+from app.models.user import User
+from app.utils.db_utils import upsert_increments
+
+# Row counters keyed by model, plus per-status breakdowns
+COUNTED_MODELS = {User: "users", Project: "projects", Team: "teams", Task: "tasks"}
+STATUS_COUNTED_MODELS = {Task: "tasks.status", Project: "projects.status"}
+
+
+def status_key(prefix: str, status) -> str:
+    if isinstance(status, enum.Enum):
+        status = status.value
+    return f"{prefix}.{status}"
+
+
+def apply_counter_deltas(connection: Connection, deltas: Mapping[str, int]):
+    """
+    Add `deltas` to the counters within the caller's transaction.
+    Use this for bulk statements that bypass the ORM flush.
+    """
+    upsert_increments(connection, MetricCounter.__table__, "name", "value", deltas)
+
+
+def read_counters(db: Session) -> Dict[str, int]:
+    return {name: value for name, value in db.execute(select(MetricCounter.name, MetricCounter.value))}
+
+
+def rebuild_counters(db: Session):
+    """
+    Recompute every counter from the base tables. Used to seed or repair them.
+    """
+    values: Dict[str, int] = {}
+    for model, key in COUNTED_MODELS.items():
+        values[key] = db.scalar(select(func.count()).select_from(model))
+    for model, prefix in STATUS_COUNTED_MODELS.items():
+        rows = db.execute(select(model.status, func.count()).where(model.status.isnot(None)).group_by(model.status))
+        for status, count in rows:
+            values[status_key(prefix, status)] = count
+
+    db.execute(delete(MetricCounter))
+    db.add_all([MetricCounter(name=name, value=value) for name, value in values.items()])
+    db.commit()
+
+
+# ----------------- FLUSH HOOK -----------------
+def _status_of(obj):
+    return inspect(obj).dict.get("status")
+
+
+@event.listens_for(Session, "after_flush")
+def _track_counters(session: Session, flush_context):
+    """
+    Translate inserted, deleted and status-changed rows of the counted
+    models into counter deltas, written in the same transaction.
+    """
+    deltas: Counter = Counter()
+
+    for obj in session.new:
+        model = type(obj)
+        if model in COUNTED_MODELS:
+            deltas[COUNTED_MODELS[model]] += 1
+        if model in STATUS_COUNTED_MODELS and _status_of(obj) is not None:
+            deltas[status_key(STATUS_COUNTED_MODELS[model], _status_of(obj))] += 1
+
+    for obj in session.deleted:
+        model = type(obj)
+        if model in COUNTED_MODELS:
+            deltas[COUNTED_MODELS[model]] -= 1
+        if model in STATUS_COUNTED_MODELS and _status_of(obj) is not None:
+            deltas[status_key(STATUS_COUNTED_MODELS[model], _status_of(obj))] -= 1
+
+    for obj in session.dirty:
+        model = type(obj)
+        if model not in STATUS_COUNTED_MODELS or obj in session.deleted:
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.has_changes():
+            continue
+        prefix = STATUS_COUNTED_MODELS[model]
+        for old in history.deleted:
+            if old is not None:
+                deltas[status_key(prefix, old)] -= 1
+        for new in history.added:
+            if new is not None:
+                deltas[status_key(prefix, new)] += 1
+
+    if any(deltas.values()):
+        apply_counter_deltas(session.connection(), deltas)
+
@@ -1,15 +1,18 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from decouple import config
-import ssl
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+import os
 from datetime import datetime
+import asyncio
 import logging
+import time
+from typing import TYPE_CHECKING
 
-# ----------------- ENVIRONMENT CONFIG -----------------
-ENVIRONMENT = config("ENVIRONMENT", default="dev").lower()
+from app.core.config import ENVIRONMENT
+from app.utils.rate_limiter import TokenBucket
+
+if TYPE_CHECKING:
+    import httpx
+
+# Provider SDKs (sendgrid, smtplib/MIME, aiosmtplib, httpx) are imported on
+# first send, so importing the app does not pay for them.
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -17,16 +20,16 @@ logger = logging.getLogger(__name__)
 
 if ENVIRONMENT == "dev":
     # ===== Development: MailHog =====
-    SMTP_HOST = config("SMTP_HOST", default="localhost")
-    SMTP_PORT = int(config("SMTP_PORT", default=1025))
-    SMTP_USER = config("SMTP_USER", default="")
-    SMTP_PASS = config("SMTP_PASS", default="")
-    DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="admin@local.dev")
+    SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+    SMTP_PORT = int(os.getenv("SMTP_PORT", "1025"))
+    SMTP_USER = os.getenv("SMTP_USER", "")
+    SMTP_PASS = os.getenv("SMTP_PASS", "")
+    DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "admin@local.dev")
     FROM_NAME = "Project Team Management (Dev)"
 else:
     # ===== Production: SendGrid =====
-    SENDGRID_API_KEY = config("SENDGRID_API_KEY", default="")
-    DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL_PROD", default="krithickt.22it@kongu.edu")
+    SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY", "")
+    DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL_PROD", "krithickt.22it@kongu.edu")
     FROM_NAME = "Project Team Management"
     
     # Validate SendGrid configuration
@@ -35,6 +38,16 @@ else:
     else:
         logger.info("✅ SendGrid API key configured successfully")
 
+SENDGRID_API_URL = os.getenv("SENDGRID_API_URL", "https://api.sendgrid.com/v3/mail/send")
+
+# Async transport limits
+EMAIL_MAX_CONCURRENCY = int(os.getenv("EMAIL_MAX_CONCURRENCY", "10"))
+EMAIL_TIMEOUT_SECONDS = float(os.getenv("EMAIL_TIMEOUT_SECONDS", "10"))
+SMTP_RATE_PER_SECOND = float(os.getenv("SMTP_RATE_PER_SECOND", "20"))
+SENDGRID_RATE_PER_SECOND = float(os.getenv("SENDGRID_RATE_PER_SECOND", "50"))
+# Time a shutting-down worker waits for pending emails
+EMAIL_DRAIN_TIMEOUT_SECONDS = float(os.getenv("EMAIL_DRAIN_TIMEOUT_SECONDS", "20"))
+
 
 # ----------------- EMAIL TEMPLATE HELPERS -----------------
 def get_email_footer():
@@ -58,21 +71,9 @@ def get_email_header(title: str):
     <div style="background: #f9fafb; padding: 20px; border-radius: 0 0 8px 8px;">
     """
 
-# ----------------- GENERIC EMAIL FUNCTION -----------------
-def send_email(subject: str, recipients: list[str], body: str, email_type: str = "notification"):
-    """
-    Send a professional email through MailHog (dev) or SendGrid (prod).
-    """
-    if not recipients:
-        logger.warning("No recipients provided for email")
-        return False
-        
-    logger.info(f"📧 Sending {email_type} email to {len(recipients)} recipient(s)")
-    logger.info(f"📧 Recipients: {', '.join(recipients)}")
-    logger.info(f"📧 Environment: {ENVIRONMENT}")
-    
-    # Create professional email template
-    full_body = f"""
+def render_email_html(subject: str, body: str) -> str:
+    """Wrap a notification body in the professional email layout"""
+    return f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -88,9 +89,29 @@ def send_email(subject: str, recipients: list[str], body: str, email_type: str =
     </body>
     </html>
     """
+
+
+# ----------------- GENERIC EMAIL FUNCTION -----------------
+def send_email(subject: str, recipients: list[str], body: str, email_type: str = "notification"):
+    """
+    Send a professional email through MailHog (dev) or SendGrid (prod).
+    """
+    if not recipients:
+        logger.warning("No recipients provided for email")
+        return False
+        
+    logger.info(f"📧 Sending {email_type} email to {len(recipients)} recipient(s)")
+    logger.info(f"📧 Recipients: {', '.join(recipients)}")
+    logger.info(f"📧 Environment: {ENVIRONMENT}")
     
+    full_body = render_email_html(subject, body)
+    import smtplib
+
     try:
         if ENVIRONMENT == "dev":
+            from email.mime.multipart import MIMEMultipart
+            from email.mime.text import MIMEText
+
             # Local MailHog - capture emails
             msg = MIMEMultipart()
             msg["From"] = f"{FROM_NAME} <{DEFAULT_FROM_EMAIL}>"
@@ -108,6 +129,9 @@ def send_email(subject: str, recipients: list[str], body: str, email_type: str =
                 logger.error("❌ Email disabled: SENDGRID_API_KEY missing. Skipping send.")
                 return False
                 
+            from sendgrid import SendGridAPIClient
+            from sendgrid.helpers.mail import Mail
+
             logger.info("📧 Using SendGrid for production email")
             sg = SendGridAPIClient(api_key=SENDGRID_API_KEY)
             
@@ -143,13 +167,202 @@ def send_email(subject: str, recipients: list[str], body: str, email_type: str =
         return False
 
 
+# ----------------- ASYNC EMAIL TRANSPORT -----------------
+class AsyncEmailTransport:
+    """
+    Asyncio-native email delivery through SMTP (MailHog) or the SendGrid HTTP API.
+    A global semaphore bounds concurrent sends, a token bucket rate-limits the
+    provider, and every message is bounded by a timeout, so notifications go out
+    in parallel without occupying threadpool slots.
+    """
+    def __init__(
+        self,
+        provider: str,
+        max_concurrency: int = EMAIL_MAX_CONCURRENCY,
+        timeout: float = EMAIL_TIMEOUT_SECONDS,
+        rate_per_second: float | None = None,
+        smtp_host: str = "localhost",
+        smtp_port: int = 1025,
+        smtp_user: str = "",
+        smtp_pass: str = "",
+        sendgrid_api_key: str = "",
+        sendgrid_api_url: str = SENDGRID_API_URL,
+    ):
+        if provider not in ("smtp", "sendgrid"):
+            raise ValueError(f"Unknown email provider: {provider}")
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        if rate_per_second is None:
+            rate_per_second = SMTP_RATE_PER_SECOND if provider == "smtp" else SENDGRID_RATE_PER_SECOND
+        self.rate_limiter = TokenBucket(rate_per_second)
+        self.smtp_host = smtp_host
+        self.smtp_port = smtp_port
+        self.smtp_user = smtp_user
+        self.smtp_pass = smtp_pass
+        self.sendgrid_api_key = sendgrid_api_key
+        self.sendgrid_api_url = sendgrid_api_url
+
+        self._semaphore: asyncio.Semaphore | None = None
+        self._http_client: "httpx.AsyncClient | None" = None
+
+        # Queue depth: messages waiting for a slot / messages on the wire
+        self.queued = 0
+        self.in_flight = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_http_client(self) -> "httpx.AsyncClient":
+        if self._http_client is None or self._http_client.is_closed:
+            import httpx
+
+            self._http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+                headers={"Authorization": f"Bearer {self.sendgrid_api_key}"},
+            )
+        return self._http_client
+
+    async def send(self, subject: str, recipients: list[str], body: str, email_type: str = "notification") -> bool:
+        """
+        Send a single message addressed to all recipients.
+        """
+        if not recipients:
+            logger.warning("No recipients provided for email")
+            return False
+        if self.provider == "sendgrid" and not self.sendgrid_api_key:
+            logger.error("❌ Email disabled: SENDGRID_API_KEY missing. Skipping send.")
+            return False
+
+        full_body = render_email_html(subject, body)
+        self.queued += 1
+        dequeued = False
+        try:
+            async with self._get_semaphore():
+                await self.rate_limiter.acquire()
+                self.queued -= 1
+                dequeued = True
+                self.in_flight += 1
+                try:
+                    await asyncio.wait_for(self._deliver(subject, recipients, full_body), self.timeout)
+                finally:
+                    self.in_flight -= 1
+            logger.info(f"✅ [{self.provider}] {email_type} email sent to {len(recipients)} recipient(s)")
+            return True
+        except asyncio.TimeoutError:
+            logger.error(f"❌ [{self.provider}] Timed out sending {email_type} email to {recipients}")
+            return False
+        except Exception as e:
+            logger.error(f"❌ [{self.provider}] Error sending {email_type} email to {recipients}: {e}")
+            return False
+        finally:
+            if not dequeued:
+                self.queued -= 1
+
+    async def send_each(self, subject: str, recipients: list[str], body: str, email_type: str = "notification") -> int:
+        """
+        Send a separate message to every recipient concurrently.
+        Returns the number of successful deliveries.
+        """
+        results = await asyncio.gather(
+            *(self.send(subject, [recipient], body, email_type) for recipient in recipients)
+        )
+        return sum(1 for ok in results if ok)
+
+    async def _deliver(self, subject: str, recipients: list[str], full_body: str):
+        if self.provider == "smtp":
+            from email.mime.multipart import MIMEMultipart
+            from email.mime.text import MIMEText
+
+            import aiosmtplib
+
+            msg = MIMEMultipart()
+            msg["From"] = f"{FROM_NAME} <{DEFAULT_FROM_EMAIL}>"
+            msg["To"] = ", ".join(recipients)
+            msg["Subject"] = subject
+            msg.attach(MIMEText(full_body, "html"))
+            await aiosmtplib.send(
+                msg,
+                hostname=self.smtp_host,
+                port=self.smtp_port,
+                username=self.smtp_user or None,
+                password=self.smtp_pass or None,
+                timeout=self.timeout,
+            )
+            return
+
+        response = await self._get_http_client().post(self.sendgrid_api_url, json={
+            "personalizations": [{"to": [{"email": r} for r in recipients]}],
+            "from": {"email": DEFAULT_FROM_EMAIL, "name": FROM_NAME},
+            "subject": subject,
+            "content": [{"type": "text/html", "value": full_body}],
+        })
+        if response.status_code not in (200, 201, 202):
+            raise RuntimeError(f"SendGrid responded with status {response.status_code}")
+
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def drain(self, timeout: float = EMAIL_DRAIN_TIMEOUT_SECONDS) -> bool:
+        """
+        Wait for queued and in-flight messages to finish, up to `timeout`
+        seconds, then close the HTTP client. Returns False if messages were
+        still pending when the timeout expired.
+        """
+        deadline = time.monotonic() + timeout
+        while (self.queued or self.in_flight) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        pending = self.queued + self.in_flight
+        if pending:
+            logger.warning(f"⚠️  Shutting down with {pending} email(s) still pending")
+        await self.aclose()
+        return not pending
+
+    def reset_after_fork(self):
+        """The semaphore and HTTP client are bound to the parent's event loop."""
+        self._semaphore = None
+        self._http_client = None
+        self.queued = 0
+        self.in_flight = 0
+
+
+def _create_default_transport() -> AsyncEmailTransport:
+    if ENVIRONMENT == "dev":
+        return AsyncEmailTransport(
+            provider="smtp",
+            smtp_host=SMTP_HOST,
+            smtp_port=SMTP_PORT,
+            smtp_user=SMTP_USER,
+            smtp_pass=SMTP_PASS,
+        )
+    return AsyncEmailTransport(provider="sendgrid", sendgrid_api_key=SENDGRID_API_KEY)
+
+
+# Singleton instance
+email_transport = _create_default_transport()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=email_transport.reset_after_fork)
+
+
+async def send_email_async(subject: str, recipients: list[str], body: str, email_type: str = "notification") -> bool:
+    """
+    Async counterpart of `send_email` using the shared transport.
+    """
+    return await email_transport.send(subject, recipients, body, email_type)
+
+
 # ----------------- TASK EMAILS -----------------
-def send_task_assigned_email(member_email: str, project_name: str, task_title: str, assigned_by: str, task_description: str = ""):
+def build_task_assigned_email(project_name: str, task_title: str, assigned_by: str, task_description: str = "") -> tuple[str, str]:
     """
-    Notify user when a new task is assigned with professional email template.
+    Build the subject and body for a task assignment notification.
     """
-    logger.info(f"📧 Sending task assignment email to {member_email}")
-    
     subject = f"🎯 New Task Assigned: {task_title}"
     
     body = f"""
@@ -196,22 +409,36 @@ def send_task_assigned_email(member_email: str, project_name: str, task_title: s
     </div>
     """
     
+    return subject, body
+
+
+def send_task_assigned_email(member_email: str, project_name: str, task_title: str, assigned_by: str, task_description: str = ""):
+    """
+    Notify user when a new task is assigned with professional email template.
+    """
+    logger.info(f"📧 Sending task assignment email to {member_email}")
+    subject, body = build_task_assigned_email(project_name, task_title, assigned_by, task_description)
     return send_email(subject, [member_email], body, "task_assignment")
 
 
-def send_task_status_update_email(
-    recipients: list[str],
+async def notify_task_assigned(recipients: list[str], project_name: str, task_title: str, assigned_by: str, task_description: str = ""):
+    """
+    Send one task assignment email per recipient concurrently through the async transport.
+    """
+    subject, body = build_task_assigned_email(project_name, task_title, assigned_by, task_description)
+    return await email_transport.send_each(subject, recipients, body, "task_assignment")
+
+
+def build_task_status_update_email(
     project_name: str,
     task_title: str,
     new_status: str,
     updated_by: str,
     previous_status: str = ""
-):
+) -> tuple[str, str]:
     """
-    Notify team when a task status is updated with professional email template.
+    Build the subject and body for a task status update notification.
     """
-    logger.info(f"📧 Sending task status update email to {len(recipients)} recipient(s)")
-    
     status_colors = {
         "incomplete": ("#ef4444", "INCOMPLETE"),
         "in_progress": ("#f59e0b", "IN PROGRESS"), 
@@ -263,9 +490,40 @@ def send_task_status_update_email(
     </div>
     """
     
+    return subject, body
+
+
+def send_task_status_update_email(
+    recipients: list[str],
+    project_name: str,
+    task_title: str,
+    new_status: str,
+    updated_by: str,
+    previous_status: str = ""
+):
+    """
+    Notify team when a task status is updated with professional email template.
+    """
+    logger.info(f"📧 Sending task status update email to {len(recipients)} recipient(s)")
+    subject, body = build_task_status_update_email(project_name, task_title, new_status, updated_by, previous_status)
     return send_email(subject, recipients, body, "status_update")
 
 
+async def notify_task_status_updated(
+    recipients: list[str],
+    project_name: str,
+    task_title: str,
+    new_status: str,
+    updated_by: str,
+    previous_status: str = ""
+):
+    """
+    Send one status update email per recipient concurrently through the async transport.
+    """
+    subject, body = build_task_status_update_email(project_name, task_title, new_status, updated_by, previous_status)
+    return await email_transport.send_each(subject, recipients, body, "status_update")
+
+
 def send_team_member_added_email(member_email: str, team_name: str, project_name: str, added_by: str):
     """
     Notify user when they are added to a team.
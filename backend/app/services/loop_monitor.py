@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.services.metrics import EVENT_LOOP_LAG, EVENT_LOOP_LAG_HISTOGRAM, EVENT_LOOP_STALLS_TOTAL
+from app.services.profiler import folded_stack
+
+LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))
+# Debug mode: a watchdog thread captures the stack of whatever holds the loop
+LOOP_MONITOR_DEBUG = os.getenv("LOOP_MONITOR_DEBUG", "false").lower() in ["1", "true", "yes"]
+LOOP_STALL_RING_SIZE = int(os.getenv("LOOP_STALL_RING_SIZE", "50"))
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop scheduling delay by sleeping a fixed interval and
+    comparing the actual wake-up time with the expected one. In debug mode a
+    watchdog thread notices when the loop stops ticking for longer than the
+    stall threshold and records the loop thread's stack at that moment.
+    """
+    def __init__(
+        self,
+        interval_ms: float = LOOP_LAG_INTERVAL_MS,
+        stall_threshold_ms: float = LOOP_STALL_THRESHOLD_MS,
+        debug: bool = LOOP_MONITOR_DEBUG,
+        ring_size: int = LOOP_STALL_RING_SIZE,
+    ):
+        self.interval = interval_ms / 1000
+        self.stall_threshold = stall_threshold_ms / 1000
+        self.debug = debug
+        self.stalls: deque = deque(maxlen=ring_size)
+        self.last_lag = 0.0
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._captured_heartbeat: Optional[float] = None
+        self._lock = threading.Lock()
+
+    async def _measure(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._heartbeat = time.monotonic()
+            self.last_lag = lag
+            EVENT_LOOP_LAG.set(lag)
+            EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+            if lag >= self.stall_threshold:
+                EVENT_LOOP_STALLS_TOTAL.inc()
+                self._finish_stall(lag)
+
+    def _finish_stall(self, lag: float):
+        # The watchdog saw this stall while it was happening; record how long it lasted
+        with self._lock:
+            if self._captured_heartbeat is not None and self.stalls:
+                self.stalls[-1]["blocked_ms"] = round(lag * 1000, 1)
+            self._captured_heartbeat = None
+
+    def _watch(self):
+        check_every = max(self.stall_threshold / 4, 0.005)
+        while not self._stop.wait(check_every):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.stall_threshold or self._captured_heartbeat == heartbeat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            with self._lock:
+                self._captured_heartbeat = heartbeat
+                self.stalls.append({
+                    "captured_at": datetime.utcnow().isoformat() + "Z",
+                    "blocked_ms": round(blocked_for * 1000, 1),
+                    "folded_stack": folded_stack(frame),
+                    "stack": stack,
+                })
+            logger.warning(f"⚠️  Event loop blocked for {blocked_for * 1000:.0f}ms+ in:\n{stack}")
+
+    def start(self):
+        """Start measuring; must be called from the running event loop."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        if self.debug:
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def recent_stalls(self) -> List[Dict]:
+        with self._lock:
+            return list(reversed(self.stalls))
+
+
+# Singleton instance
+loop_monitor = LoopLagMonitor()
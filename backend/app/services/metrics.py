@@ -0,0 +1,253 @@
+import bisect
+import math
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    Base class for a labelled metric family.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts..., +Inf count], sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1])) for key, state in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, (("le", _format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds metric families and renders them in the Prometheus text format.
+    Collectors are callbacks run right before rendering to refresh gauges
+    whose values are read from other components.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in list(self._collectors):
+            collector()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# Singleton instance
+registry = MetricsRegistry()
+
+# ----------------- HTTP -----------------
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Time until the response body was sent, per route.", ("method", "route")
+)
+HTTP_REQUESTS_TOTAL = registry.counter(
+    "http_requests_total", "Completed HTTP requests.", ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."
+)
+
+# ----------------- DATABASE -----------------
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request", "SQL statements executed per request.", ("method", "route"), buckets=QUERY_COUNT_BUCKETS
+)
+DB_TIME_PER_REQUEST = registry.histogram(
+    "db_time_per_request_seconds", "Time spent executing SQL per request.", ("method", "route")
+)
+DB_QUERIES_TOTAL = registry.counter(
+    "db_queries_total", "SQL statements executed."
+)
+DB_POOL_WAIT = registry.histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_WAIT_AVERAGE = registry.gauge(
+    "db_pool_wait_average_seconds", "Recent average wait for a pooled connection (decays while idle)."
+)
+
+# ----------------- THREADPOOL -----------------
+THREADPOOL_BUSY = registry.gauge(
+    "threadpool_busy_threads", "Worker threads currently running sync endpoints and dependencies."
+)
+THREADPOOL_MAX = registry.gauge(
+    "threadpool_max_threads", "Size of the worker threadpool."
+)
+THREADPOOL_WAITING = registry.gauge(
+    "threadpool_waiting_tasks", "Calls waiting for a free worker thread."
+)
+
+# ----------------- WEBSOCKETS -----------------
+WS_CONNECTIONS = registry.gauge(
+    "websocket_connections", "Open WebSocket connections per project.", ("project_id",)
+)
+WS_BROADCAST_DURATION = registry.histogram(
+    "websocket_broadcast_duration_seconds", "Time to deliver one broadcast to all subscribers of a project."
+)
+
+# ----------------- EMAIL -----------------
+EMAIL_QUEUE_DEPTH = registry.gauge(
+    "email_queue_depth", "Emails waiting for a concurrency slot or rate-limit token."
+)
+EMAIL_IN_FLIGHT = registry.gauge(
+    "email_in_flight", "Emails currently being delivered."
+)
+
+# ----------------- EVENT LOOP -----------------
+EVENT_LOOP_LAG = registry.gauge(
+    "event_loop_lag_seconds", "Most recent event loop scheduling delay."
+)
+EVENT_LOOP_LAG_HISTOGRAM = registry.histogram(
+    "event_loop_lag_distribution_seconds", "Event loop scheduling delay.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_STALLS_TOTAL = registry.counter(
+    "event_loop_stalls_total", "Times a callback held the event loop beyond the stall threshold."
+)
+
+# ----------------- RESPONSE CACHE -----------------
+RESPONSE_CACHE_REQUESTS = registry.counter(
+    "response_cache_requests_total", "Response cache lookups per endpoint.", ("endpoint", "result")
+)
+SINGLE_FLIGHT_COLLAPSED = registry.counter(
+    "single_flight_collapsed_total", "Requests served from another request's in-flight query.", ("endpoint",)
+)
+
+# ----------------- ADMISSION CONTROL -----------------
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total", "Requests refused before reaching a route.", ("route_class", "reason")
+)
+ADMISSION_IN_FLIGHT = registry.gauge(
+    "admission_in_flight", "Admitted requests currently being served."
+)
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from typing import NamedTuple, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+# Admin emails change only when roles change, so they are cached per process.
+# The TTL bounds staleness for role changes made by other worker processes.
+ADMIN_EMAIL_CACHE_TTL = float(os.getenv("ADMIN_EMAIL_CACHE_TTL", "300"))
+
+
+class TaskNotificationContext(NamedTuple):
+    project_name: Optional[str]
+    recipients: Set[str]
+
+
+# ----------------- ADMIN EMAIL CACHE -----------------
+_admin_emails: Optional[frozenset] = None
+_admin_emails_loaded_at = 0.0
+_admin_emails_lock = threading.Lock()
+
+
+def get_admin_emails(db: Session) -> frozenset:
+    """
+    Return the emails of all admins, loading them at most once per TTL.
+    """
+    global _admin_emails, _admin_emails_loaded_at
+    with _admin_emails_lock:
+        if _admin_emails is not None and time.monotonic() - _admin_emails_loaded_at < ADMIN_EMAIL_CACHE_TTL:
+            return _admin_emails
+
+    emails = frozenset(
+        email for email in db.scalars(select(User.email).where(User.role == "admin")) if email
+    )
+    with _admin_emails_lock:
+        _admin_emails = emails
+        _admin_emails_loaded_at = time.monotonic()
+    return emails
+
+
+def invalidate_admin_emails() -> None:
+    """
+    Drop the cached admin emails. Call whenever a user's role changes.
+    """
+    global _admin_emails
+    with _admin_emails_lock:
+        _admin_emails = None
+
+
+# ----------------- TASK RECIPIENTS -----------------
+def task_notification_columns():
+    """
+    Scalar subqueries correlated to ``tasks`` that resolve everything a task
+    notification needs: the project name, the owner email and the assignee email.
+    """
+    project_name = (
+        select(Project.name)
+        .where(Project.id == Task.project_id)
+        .correlate(Task)
+        .scalar_subquery()
+        .label("project_name")
+    )
+    owner_email = (
+        select(User.email)
+        .join(Project, Project.owner_id == User.id)
+        .where(Project.id == Task.project_id)
+        .correlate(Task)
+        .scalar_subquery()
+        .label("owner_email")
+    )
+    assignee_email = (
+        select(User.email)
+        .where(User.id == Task.assigned_to_id)
+        .correlate(Task)
+        .scalar_subquery()
+        .label("assignee_email")
+    )
+    return project_name, owner_email, assignee_email
+
+
+def build_task_notification(db: Session, project_name, owner_email, assignee_email) -> TaskNotificationContext:
+    """
+    Merge the per-task emails with the cached admin emails.
+    """
+    recipients = set(get_admin_emails(db))
+    if assignee_email:
+        recipients.add(assignee_email)
+    if owner_email:
+        recipients.add(owner_email)
+    return TaskNotificationContext(project_name=project_name, recipients=recipients)
+
+
+def resolve_task_notification(db: Session, task_id: int) -> TaskNotificationContext:
+    """
+    Collect the project name and all emails that should be notified about a task
+    in a single query (plus one admin lookup when the admin cache is cold).
+    """
+    row = db.execute(select(*task_notification_columns()).where(Task.id == task_id)).first()
+    if row is None:
+        return TaskNotificationContext(project_name=None, recipients=set())
+    return build_task_notification(db, row.project_name, row.owner_email, row.assignee_email)
@@ -0,0 +1,165 @@
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+# Slow-request capture (0 disables the background sampler)
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "0"))
+SLOW_REQUEST_SAMPLE_INTERVAL_MS = float(os.getenv("SLOW_REQUEST_SAMPLE_INTERVAL_MS", "10"))
+SLOW_REQUEST_RING_SIZE = int(os.getenv("SLOW_REQUEST_RING_SIZE", "50"))
+SLOW_REQUEST_SAMPLE_BUFFER = int(os.getenv("SLOW_REQUEST_SAMPLE_BUFFER", "100000"))
+
+
+# ----------------- STACK HELPERS -----------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    marker = f"{os.sep}site-packages{os.sep}"
+    if marker in filename:
+        filename = filename.split(marker, 1)[1]
+    elif filename.startswith(os.getcwd() + os.sep):
+        filename = os.path.relpath(filename)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def folded_stack(frame) -> str:
+    """
+    Render a frame and its callers in the collapsed "root;...;leaf" format
+    understood by flamegraph.pl, speedscope and similar tools.
+    """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def render_folded(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+# ----------------- ON-DEMAND PROFILER -----------------
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads from a background thread at a fixed
+    interval. Overhead is one `sys._current_frames()` call per interval.
+    """
+    def __init__(self, interval: float = 0.005, thread_ids: Optional[Set[int]] = None):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                self.stacks[folded_stack(frame)] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+
+# ----------------- SLOW-REQUEST CAPTURE -----------------
+class SlowRequestRecorder:
+    """
+    Continuously samples thread stacks into a bounded buffer. When a request
+    finishes slower than the threshold, the samples taken during its lifetime
+    on the threads that worked for it are folded into a profile and kept in
+    a bounded ring for later inspection.
+    """
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_REQUEST_THRESHOLD_MS,
+        interval_ms: float = SLOW_REQUEST_SAMPLE_INTERVAL_MS,
+        ring_size: int = SLOW_REQUEST_RING_SIZE,
+        buffer_size: int = SLOW_REQUEST_SAMPLE_BUFFER,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.records: deque = deque(maxlen=ring_size)
+        # (monotonic time, thread id, folded stack)
+        self._samples: deque = deque(maxlen=buffer_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._samples.append((now, thread_id, folded_stack(frame)))
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="slow-request-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def observe(self, method: str, path: str, route: str, started: float, finished: float, thread_ids: Iterable[int]):
+        """
+        Record a profile for the request if it exceeded the threshold.
+        `started` and `finished` are `time.monotonic()` values.
+        """
+        if not self.enabled or finished - started < self.threshold:
+            return
+        threads = set(thread_ids)
+        stacks: Counter = Counter(
+            stack for ts, thread_id, stack in list(self._samples)
+            if started <= ts <= finished and thread_id in threads
+        )
+        with self._lock:
+            self.records.append({
+                "id": next(self._ids),
+                "method": method,
+                "path": path,
+                "route": route,
+                "duration_ms": round((finished - started) * 1000, 1),
+                "samples": sum(stacks.values()),
+                "captured_at": datetime.utcnow().isoformat() + "Z",
+                "stacks": stacks,
+            })
+
+    def summaries(self) -> List[Dict]:
+        with self._lock:
+            return [{k: v for k, v in r.items() if k != "stacks"} for r in reversed(self.records)]
+
+    def get(self, record_id: int) -> Optional[Dict]:
+        with self._lock:
+            return next((r for r in self.records if r["id"] == record_id), None)
+
+
+# Singleton instance
+slow_request_recorder = SlowRequestRecorder()
@@ -0,0 +1,216 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.services.metrics import RESPONSE_CACHE_REQUESTS
+from app.services.single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+# "memory" (per process), "redis" (shared between workers) or "none"
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+
+
+# ----------------- BACKENDS -----------------
+class MemoryCacheBackend:
+    """
+    Thread-safe LRU with a per-entry TTL and a tag index, so a write can
+    drop every entry derived from the scopes it touched.
+    """
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expires_at, body, tags)
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, body: bytes, tags: Sequence[str]):
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, body, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Shared backend for multi-worker deployments. Each tag is a Redis set of
+    the keys derived from it; entries and tag sets both expire with the TTL.
+    """
+    def __init__(self, url: str = RESPONSE_CACHE_REDIS_URL, ttl: float = RESPONSE_CACHE_TTL_SECONDS, prefix: str = "rc:"):
+        import redis  # optional dependency, only needed for this backend
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = max(1, int(ttl))
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, body: bytes, tags: Sequence[str]):
+        pipe = self.client.pipeline()
+        pipe.setex(self.prefix + key, self.ttl, body)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), self.prefix + key)
+            pipe.expire(self._tag_key(tag), self.ttl)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]):
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = self.client.smembers(tag_key)
+            self.client.delete(tag_key, *keys)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+# ----------------- CACHE -----------------
+class ResponseCache:
+    """
+    Caches encoded JSON bodies. Keys include the version token of the scopes
+    the response depends on, so an entry can never be served after a
+    committed write; tag invalidation on commit frees it right away.
+    Backend errors degrade to a cache miss.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def make_key(endpoint: str, parts: Sequence[object]) -> str:
+        digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+        return f"{endpoint}:{digest}"
+
+    def get_or_build(self, endpoint: str, parts: Sequence[object], tags: Sequence[str], build: Callable[[], bytes]) -> bytes:
+        """
+        `parts` identify the request (path/query parameters, caller scope and
+        versions token); `tags` are the scopes whose writes invalidate it.
+        Concurrent misses for the same key share a single `build()`.
+        """
+        key = self.make_key(endpoint, parts)
+        if self.backend is None:
+            return single_flight.do(key, build, label=endpoint)[0]
+
+        try:
+            body = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            body = None
+        if body is not None:
+            RESPONSE_CACHE_REQUESTS.inc(endpoint=endpoint, result="hit")
+            return body
+
+        def build_and_store() -> bytes:
+            RESPONSE_CACHE_REQUESTS.inc(endpoint=endpoint, result="miss")
+            body = build()
+            try:
+                self.backend.set(key, body, tags)
+            except Exception as e:
+                logger.warning(f"Response cache write failed: {e}")
+            return body
+
+        return single_flight.do(key, build_and_store, label=endpoint)[0]
+
+    def invalidate(self, tags: Iterable[str]):
+        if self.backend is None:
+            return
+        try:
+            self.backend.invalidate(tags)
+        except Exception as e:
+            logger.warning(f"Response cache invalidation failed: {e}")
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+
+def _create_default_cache() -> ResponseCache:
+    if RESPONSE_CACHE_BACKEND == "none":
+        return ResponseCache(None)
+    if RESPONSE_CACHE_BACKEND == "redis":
+        try:
+            return ResponseCache(RedisCacheBackend())
+        except ImportError:
+            logger.warning("RESPONSE_CACHE_BACKEND=redis but the redis package is not installed; using memory")
+    return ResponseCache(MemoryCacheBackend())
+
+
+# Singleton instance
+response_cache = _create_default_cache()
+
+
+def json_body_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+# ----------------- INVALIDATION -----------------
+@event.listens_for(Session, "after_commit")
+def _invalidate_bumped_scopes(session: Session):
+    """Drop entries tagged with the scopes `bump_versions` touched in the committed transaction."""
+    scopes = session.info.pop("bumped_scopes", None)
+    if scopes:
+        response_cache.invalidate(scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bumped_scopes(session: Session):
+    session.info.pop("bumped_scopes", None)
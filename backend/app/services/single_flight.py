@@ -0,0 +1,64 @@
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.services.metrics import SINGLE_FLIGHT_COLLAPSED
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution. The first
+    caller runs `fn`; callers arriving while it runs block until it finishes
+    and share its result (or exception). Nothing is kept once the call ends.
+
+    Blocking, so use it from sync endpoints (they run in the threadpool).
+    """
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any], label: str = "") -> Tuple[Any, bool]:
+        """Return `(result, shared)` where `shared` is True for collapsed callers."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            SINGLE_FLIGHT_COLLAPSED.inc(endpoint=label or key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+# Singleton instance
+single_flight = SingleFlight()
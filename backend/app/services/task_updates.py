@@ -0,0 +1,112 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.task import Task
+from app.services.counter_service import apply_counter_deltas, status_key
+from app.services.notification_service import task_notification_columns
+from app.services.versioning import bump_versions, project_scope, row_etag
+
+# Unconditional updates that lose a race with another writer are retried this often
+UPDATE_ATTEMPTS = 3
+
+
+def task_etag(task_id: int, version: int) -> str:
+    return row_etag("task", task_id, version)
+
+
+def _returning_columns():
+    return (
+        Task.id, Task.title, Task.description, Task.status,
+        Task.project_id, Task.assigned_to_id, Task.version,
+        *task_notification_columns(),
+    )
+
+
+def _conflict(task_id: int, version: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Task was modified by someone else; reload it and retry",
+        headers={"ETag": task_etag(task_id, version)},
+    )
+
+
+def update_task_row(
+    db: Session,
+    task_id: int,
+    values: Dict[str, Any],
+    permitted: ColumnElement,
+    expected_versions: Optional[List[int]] = None,
+) -> Row:
+    """
+    Apply `values` to a task with a single conditional
+    `UPDATE ... WHERE id AND <permitted> [AND version IN expected] RETURNING`,
+    incrementing its version. The returned row carries the new task columns,
+    the notification columns (project name, owner and assignee emails) and
+    `previous_status`.
+
+    On PostgreSQL the previous status is read by the same statement from a
+    self-join on the pre-update snapshot, guarded by the version so a
+    concurrent writer makes the update miss rather than corrupt the status
+    counters. Other databases (SQLite for local checks) cannot return joined
+    columns, so there the row is read before and after a version-guarded UPDATE.
+
+    When no row is updated, one lookup tells apart 404 (no task), 403 (not
+    `permitted`) and 409 (`expected_versions` is stale); an unconditional
+    update that lost a race is retried.
+
+    Status counters and the project scope version are updated in the same
+    transaction; the caller commits.
+    """
+    postgres = db.get_bind().dialect.name == "postgresql"
+
+    for _ in range(UPDATE_ATTEMPTS):
+        stmt = update(Task).where(Task.id == task_id, permitted)
+        if expected_versions is not None:
+            stmt = stmt.where(Task.version.in_(expected_versions))
+        stmt = stmt.values(**values, version=Task.version + 1)
+
+        if postgres:
+            prev = Task.__table__.alias("prev")
+            stmt = stmt.where(prev.c.id == Task.id, prev.c.version == Task.version).returning(
+                *_returning_columns(), prev.c.status.label("previous_status"),
+            )
+            row = db.execute(stmt, execution_options={"synchronize_session": False}).first()
+            previous_status = row.previous_status if row else None
+        else:
+            previous = db.execute(select(Task.status, Task.version).where(Task.id == task_id)).first()
+            row = None
+            if previous is not None:
+                result = db.execute(
+                    stmt.where(Task.version == previous.version), execution_options={"synchronize_session": False},
+                )
+                if result.rowcount:
+                    row = db.execute(select(*_returning_columns()).where(Task.id == task_id)).first()
+            previous_status = previous.status if previous else None
+
+        if row is not None:
+            if previous_status != row.status:
+                deltas = {}
+                if previous_status is not None:
+                    deltas[status_key("tasks.status", previous_status)] = -1
+                if row.status is not None:
+                    deltas[status_key("tasks.status", row.status)] = 1
+                apply_counter_deltas(db.connection(), deltas)
+            bump_versions(db, project_scope(row.project_id))
+            return row
+
+        current = db.execute(
+            select(Task.version, permitted.label("permitted")).where(Task.id == task_id)
+        ).first()
+        if current is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if not current.permitted:
+            raise HTTPException(status_code=403, detail="Not authorized to update this task")
+        if expected_versions is not None and current.version not in expected_versions:
+            raise _conflict(task_id, current.version)
+
+    raise _conflict(task_id, current.version)
@@ -0,0 +1,110 @@
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.scope_version import ScopeVersion
+from app.utils.db_utils import upsert_increments
+
+# Global scopes
+PROJECTS_SCOPE = "projects"  # the set of projects and their fields
+USERS_SCOPE = "users"        # user names, roles and status
+
+
+def project_scope(project_id: int) -> str:
+    """Tasks, teams and memberships of one project."""
+    return f"project:{project_id}"
+
+
+def user_scope(user_id: int) -> str:
+    """Team memberships of one user (what a member can see)."""
+    return f"user:{user_id}"
+
+
+# ----------------- WRITES -----------------
+def bump_versions(db: Session, *scopes: str):
+    """
+    Increment the version of every scope within the caller's transaction.
+    Call before `db.commit()` in every route that changes what a scope returns.
+    """
+    scopes = {s for s in scopes if s}
+    if not scopes:
+        return
+    upsert_increments(db.connection(), ScopeVersion.__table__, "scope", "version", {s: 1 for s in scopes})
+    db.info.setdefault("bumped_scopes", set()).update(scopes)
+
+
+# ----------------- READS -----------------
+def read_versions(db: Session, scopes: Iterable[str]) -> Dict[str, int]:
+    scopes = sorted(set(scopes))
+    rows = db.execute(select(ScopeVersion.scope, ScopeVersion.version).where(ScopeVersion.scope.in_(scopes)))
+    versions = {scope: 0 for scope in scopes}
+    versions.update({scope: version for scope, version in rows})
+    return versions
+
+
+def versions_token(db: Session, scopes: Iterable[str]) -> str:
+    """A stable string that changes whenever any of the scopes is bumped."""
+    return ",".join(f"{scope}={version}" for scope, version in sorted(read_versions(db, scopes).items()))
+
+
+def make_etag(token: str, *parts) -> str:
+    """
+    Weak ETag over the version token plus anything else the response depends
+    on (e.g. the caller's id when the list is filtered per user).
+    """
+    raw = "|".join([token, *(str(p) for p in parts)])
+    return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24] + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    `304 Not Modified` when the client already holds the current version,
+    otherwise None so the route runs its list query.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+    return None
+
+
+def set_etag(response: Response, etag: str) -> Response:
+    response.headers.update(cache_headers(etag))
+    return response
+
+
+# ----------------- ROW VERSIONS -----------------
+def row_etag(kind: str, row_id: int, version: int) -> str:
+    """Strong ETag naming one version of one row, for `If-Match` on updates."""
+    return f'"{kind}-{row_id}-{version}"'
+
+
+def if_match_versions(request: Request, kind: str, row_id: int) -> Optional[List[int]]:
+    """
+    The row versions accepted by the request's `If-Match`, or None when the
+    update is unconditional (no header, or `*`). Tags for other rows, weak
+    tags and malformed tags match nothing, so an empty list means conflict.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    prefix = f'"{kind}-{row_id}-'
+    versions = []
+    for candidate in if_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith(prefix) and candidate.endswith('"') and candidate[len(prefix):-1].isdigit():
+            versions.append(int(candidate[len(prefix):-1]))
+    return versions
@@ -1,6 +1,9 @@
+import time
 from typing import Dict, List
 from fastapi import WebSocket
 
+from app.services.metrics import WS_BROADCAST_DURATION
+
 class ConnectionManager:
     """
     Manages WebSocket connections per project.
@@ -27,11 +30,26 @@ class ConnectionManager:
         Broadcasts a JSON message to all WebSocket clients connected to a project.
         """
         if project_id in self.active_connections:
+            start = time.perf_counter()
             for connection in self.active_connections[project_id]:
                 try:
                     await connection.send_json(message)
                 except Exception as e:
                     print(f"❌ Error sending WebSocket message: {e}")
+            WS_BROADCAST_DURATION.observe(time.perf_counter() - start)
+
+    async def close_all(self, code: int = 1001):
+        """
+        Close every connection (1001: going away) on shutdown, so clients
+        reconnect to another worker instead of waiting on a dead socket.
+        """
+        connections = [ws for conns in self.active_connections.values() for ws in conns]
+        self.active_connections = {}
+        for connection in connections:
+            try:
+                await connection.close(code=code)
+            except Exception:
+                pass  # already closed by the client or the server
 
 
 # Singleton instance
@@ -1,36 +1,37 @@
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, JWT_SECRET_KEY
 
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 if not JWT_SECRET_KEY:
     raise RuntimeError("JWT_SECRET_KEY must be set in environment for production")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-try:
-    ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
-except ValueError:
-    ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 # bcrypt max bytes limit (operate on bytes, not characters)
 MAX_BCRYPT_BYTES = 72
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib is only needed by login, registration and imports; loaded on first use
+_pwd_context = None
+
+
+def _get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 # Password hashing
 def hash_password(password: str) -> str:
     # ensure truncation is by bytes, not characters (handles multi-byte chars)
     password_bytes = password.encode("utf-8")
     truncated_bytes = password_bytes[:MAX_BCRYPT_BYTES]
-    return pwd_context.hash(truncated_bytes)
+    return _get_pwd_context().hash(truncated_bytes)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode("utf-8")
     truncated_bytes = password_bytes[:MAX_BCRYPT_BYTES]
-    return pwd_context.verify(truncated_bytes, hashed_password)
+    return _get_pwd_context().verify(truncated_bytes, hashed_password)
 
 # JWT
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
@@ -0,0 +1,83 @@
+import csv
+import enum
+import io
+from typing import Any, Dict, List, Mapping, Sequence
+
+from sqlalchemy import Table, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+
+def upsert_increments(connection: Connection, table: Table, key_column: str, value_column: str, deltas: Mapping[str, int]):
+    """
+    Atomically add `deltas` to `value_column`, creating missing rows.
+    Keys are written in sorted order so concurrent transactions lock rows
+    in the same order and cannot deadlock.
+    """
+    rows = [{key_column: key, value_column: delta} for key, delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+
+    key_col = table.c[key_column]
+    value_col = table.c[value_column]
+    dialect = connection.dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_col],
+            set_={value_column: value_col + stmt.excluded[value_column]},
+        )
+        connection.execute(stmt, rows)
+        return
+
+    # Generic fallback: UPDATE, then INSERT when the row does not exist yet
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(key_col == row[key_column])
+            .values({value_column: value_col + row[value_column]})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(row))
+
+
+def bulk_insert(connection: Connection, table: Table, rows: Sequence[Dict[str, Any]]):
+    """
+    Insert many rows in one round trip. On PostgreSQL with psycopg2 the rows
+    are streamed with COPY; elsewhere a single executemany INSERT is used.
+    Bypasses the ORM, so flush hooks (counters) do not see these rows.
+    """
+    if not rows:
+        return
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        _copy_rows(connection, table, rows)
+    else:
+        connection.execute(insert(table), list(rows))
+
+
+def _copy_rows(connection: Connection, table: Table, rows: Sequence[Dict[str, Any]]):
+    columns: List[str] = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[name]) for name in columns])
+    buffer.seek(0)
+
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, enum.Enum):  # SQLAlchemy Enum columns store the member name
+        return value.name
+    return value
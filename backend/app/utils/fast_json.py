@@ -0,0 +1,55 @@
+from typing import Any, Iterable, List, Optional, Sequence, Type
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+def select_fields(schema: Type[BaseModel], fields: Optional[str] = None) -> List[str]:
+    """
+    Parse a sparse fieldset (`fields=id,title,status`) against a response
+    schema. Returns every schema field when omitted, otherwise the requested
+    ones in schema order; unknown names are a 400.
+    """
+    if not fields:
+        return list(schema.model_fields)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown or not requested:
+        problem = f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields requested"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{problem}. Allowed: {', '.join(schema.model_fields)}",
+        )
+    return [name for name in schema.model_fields if name in requested]
+
+
+def response_columns(schema: Type[BaseModel], model, fields: Optional[Sequence[str]] = None) -> List[Any]:
+    """
+    Mapped columns for every field of a response schema (or the `fields`
+    subset), in schema order. Selecting exactly these keeps the fast path
+    in parity with the schema.
+    """
+    return [getattr(model, name) for name in (fields if fields is not None else schema.model_fields)]
+
+
+def encode_rows(rows: Iterable[Sequence[Any]], keys: Sequence[str]) -> bytes:
+    keys = list(keys)
+    return orjson.dumps([dict(zip(keys, row)) for row in rows])
+
+
+class RowsJSONResponse(Response):
+    """
+    Encode result tuples straight to JSON with orjson, skipping ORM object
+    construction and Pydantic validation for large list responses.
+    """
+    media_type = "application/json"
+
+    def __init__(self, rows: Iterable[Sequence[Any]], keys: Sequence[str], **kwargs):
+        super().__init__(content=encode_rows(rows, keys), **kwargs)
+
+
+def rows_response(query, columns: Sequence[Any]) -> RowsJSONResponse:
+    """Run a column query and return its rows as a JSON array of objects."""
+    return RowsJSONResponse(query.all(), [column.key for column in columns])
@@ -1,18 +1,10 @@
 from datetime import datetime, timedelta
 import jwt
-import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, JWT_SECRET_KEY as SECRET_KEY
 
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 if not SECRET_KEY:
     raise RuntimeError("JWT_SECRET_KEY must be set in environment for production")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-try:
-    ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
-except ValueError:
-    ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
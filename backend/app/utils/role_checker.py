@@ -1,9 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.utils.auth_utils import decode_access_token
 from app.core.database import get_db
 from app.models.user import User
+from app.models.project import Project
+from app.models.team import Team, team_members
 
 # Token retrieval (FastAPI will auto-validate Authorization: Bearer <token>)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -41,3 +44,19 @@ def require_role(*roles):
             )
         return user
     return role_checker
+
+
+def visible_project_ids(user: User):
+    """
+    Subquery of the project ids a user may see: every project for admins,
+    owned projects for owners, and projects with one of their teams for members.
+    """
+    if user.role == "admin":
+        return select(Project.id)
+    if user.role == "owner":
+        return select(Project.id).where(Project.owner_id == user.id)
+    return (
+        select(Team.project_id)
+        .join(team_members, team_members.c.team_id == Team.id)
+        .where(team_members.c.user_id == user.id)
+    )
@@ -0,0 +1,340 @@
+"""
+Measure notification delivery throughput through the async email transport.
+
+Starts a local SMTP sink and a local SendGrid-compatible HTTP stub, runs the
+app under uvicorn on a thread of this process, and points the shared
+`email_transport` at one sink per phase. Virtual clients then create tasks
+(`POST /tasks/`, assignment emails) and rename tasks (`PUT /tasks/{id}`,
+status update emails). Each task title carries a sequence number, so every
+message that reaches a sink can be matched to the request that caused it.
+
+Reported per provider:
+- messages per second received by the sink
+- per-message latency (request sent -> message accepted by the sink)
+- missing messages (expected recipients that never arrived)
+- worker CPU per message: CPU time of the thread running the app's event
+  loop (routes, notification queries and the transport) divided by the
+  messages delivered; only on platforms with per-thread CPU clocks
+
+Run from the backend directory:
+    python -m benchmarks.bench_email_pipeline --operations 500 --clients 20
+    python -m benchmarks.bench_email_pipeline --provider sendgrid --rate-per-second 1000 --max-concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+from email import policy
+from email.parser import BytesParser
+from typing import Dict, List, Optional
+
+import httpx
+import orjson
+
+from benchmarks.load_driver import percentile
+
+TITLE_PREFIX = "bench-"
+_SEQUENCE = re.compile(re.escape(TITLE_PREFIX) + r"(\d+)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=["smtp", "sendgrid", "both"], default="both")
+    parser.add_argument("--operations", type=int, default=300, help="task requests per provider")
+    parser.add_argument("--clients", type=int, default=10, help="concurrent HTTP clients")
+    parser.add_argument("--update-share", type=float, default=0.5, help="fraction of operations that are renames")
+    parser.add_argument("--members", type=int, default=20, help="assignees tasks are spread over")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="transport semaphore (default: EMAIL_MAX_CONCURRENCY)")
+    parser.add_argument("--rate-per-second", type=float, default=None, help="transport token bucket (default: the provider's configured rate)")
+    parser.add_argument("--sink-delay-ms", type=float, default=0.0, help="simulated provider latency per message")
+    parser.add_argument("--drain", type=float, default=60.0, help="seconds to wait for queued messages")
+    return parser.parse_args()
+
+
+# ---------------- SINKS ----------------
+class Sink:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.arrivals: List[tuple] = []  # (perf_counter, sequence)
+
+    def record(self, subject: str):
+        match = _SEQUENCE.search(subject or "")
+        if match:
+            self.arrivals.append((time.perf_counter(), int(match.group(1))))
+
+
+class SMTPSink(Sink):
+    """Accepts every message; just enough SMTP for aiosmtplib."""
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.write(b"220 sink ESMTP\r\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                verb = line[:4].upper()
+                if verb in (b"EHLO", b"HELO"):
+                    writer.write(b"250 sink\r\n")
+                elif verb == b"DATA":
+                    writer.write(b"354 go ahead\r\n")
+                    await writer.drain()
+                    data = await reader.readuntil(b"\r\n.\r\n")
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    self.record(BytesParser(policy=policy.default).parsebytes(data[:-5])["subject"])
+                    writer.write(b"250 queued\r\n")
+                elif verb == b"QUIT":
+                    writer.write(b"221 bye\r\n")
+                    await writer.drain()
+                    break
+                else:  # MAIL, RCPT, RSET, NOOP
+                    writer.write(b"250 ok\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+class HTTPSink(Sink):
+    """Answers every POST with 202 like the SendGrid mail/send endpoint; keeps connections alive."""
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for header in head.split(b"\r\n")[1:]:
+                    name, _, value = header.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b"{}"
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                self.record(orjson.loads(body).get("subject", ""))
+                writer.write(b"HTTP/1.1 202 Accepted\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+# ---------------- APP ----------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class AppThread(threading.Thread):
+    """Runs the app under uvicorn on its own event loop, like a single worker."""
+
+    def __init__(self, port: int):
+        super().__init__(daemon=True)
+        import uvicorn
+
+        from app.main import app
+
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.server.serve())
+
+    def cpu_seconds(self) -> Optional[float]:
+        if not hasattr(time, "pthread_getcpuclockid"):
+            return None
+        return time.clock_gettime(time.pthread_getcpuclockid(self.ident))
+
+    def stop(self):
+        self.server.should_exit = True
+        self.join(10)
+
+
+def seed(members: int) -> dict:
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.user import User
+    from app.services.notification_service import resolve_task_notification
+    from app.utils.auth_utils import hash_password
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        hashed = hash_password("pw")
+        admin = User(name="Bench Admin", email="admin@mail.bench", hashed_password=hashed, role="admin")
+        owner = User(name="Bench Owner", email="owner@mail.bench", hashed_password=hashed, role="owner")
+        people = [User(name=f"Member {i}", email=f"member{i}@mail.bench", hashed_password=hashed, role="member") for i in range(members)]
+        db.add_all([admin, owner, *people])
+        db.flush()
+        project = Project(name="Mail bench", description="d", admin_id=admin.id, owner_id=owner.id)
+        db.add(project)
+        db.flush()
+        tasks = [Task(title="seed", description="x", project_id=project.id, assigned_to_id=m.id) for m in people]
+        db.add_all(tasks)
+        db.commit()
+        return {
+            "project": project.id,
+            "members": [m.id for m in people],
+            "tasks": [t.id for t in tasks],
+            # Every task notifies admin, owner and its assignee
+            "recipients": len(resolve_task_notification(db, tasks[0].id).recipients),
+        }
+
+
+# ---------------- DRIVER ----------------
+async def run_phase(args, provider: str, app_thread: AppThread, base_url: str, sink: Sink, sink_url: str, ids: dict, first_seq: int) -> dict:
+    from app.services import email_service
+    from app.utils.auth_utils import create_access_token
+
+    options = {"max_concurrency": args.max_concurrency} if args.max_concurrency else {}
+    if provider == "smtp":
+        host, port = sink_url.rsplit(":", 1)
+        transport = email_service.AsyncEmailTransport(
+            provider="smtp", smtp_host=host, smtp_port=int(port), rate_per_second=args.rate_per_second, **options
+        )
+    else:
+        transport = email_service.AsyncEmailTransport(
+            provider="sendgrid", sendgrid_api_key="bench", sendgrid_api_url=sink_url,
+            rate_per_second=args.rate_per_second, **options,
+        )
+    # Notification helpers look the transport up at call time
+    email_service.email_transport = transport
+
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "owner@mail.bench"})}
+    sent: Dict[int, float] = {}
+    failed_requests = 0
+    sequences = iter(range(first_seq, first_seq + args.operations))
+    statuses = ("in_progress", "incomplete", "completed")
+
+    async def client(http: httpx.AsyncClient):
+        nonlocal failed_requests
+        for seq in sequences:
+            title = f"{TITLE_PREFIX}{seq}"
+            member = ids["members"][seq % len(ids["members"])]
+            sent[seq] = time.perf_counter()
+            if (seq % 100) / 100 < args.update_share:
+                task_id = ids["tasks"][seq % len(ids["tasks"])]
+                response = await http.put(f"/tasks/{task_id}", json={"title": title, "status": statuses[seq % 3]}, headers=headers)
+            else:
+                response = await http.post("/tasks/", json={"title": title, "project_id": ids["project"], "assigned_to_id": member}, headers=headers)
+            if response.status_code not in (200, 201):
+                failed_requests += 1
+                sent.pop(seq)
+
+    sink.arrivals.clear()
+    cpu_before = app_thread.cpu_seconds()
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+        await asyncio.gather(*(client(http) for _ in range(args.clients)))
+    requests_done = time.perf_counter()
+
+    expected = len(sent) * ids["recipients"]
+    deadline = time.perf_counter() + args.drain
+    while len(sink.arrivals) < expected and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    finished = sink.arrivals[-1][0] if sink.arrivals else time.perf_counter()
+    cpu_after = app_thread.cpu_seconds()
+
+    asyncio.run_coroutine_threadsafe(transport.aclose(), app_thread.loop).result(10)
+
+    latencies = sorted(at - sent[seq] for at, seq in sink.arrivals if seq in sent)
+    delivered = len(latencies)
+    elapsed = max(finished - started, 1e-9)
+    cpu = (cpu_after - cpu_before) if cpu_before is not None else None
+    return {
+        "provider": provider,
+        "operations": args.operations,
+        "failed_requests": failed_requests,
+        "requests_seconds": requests_done - started,
+        "expected_messages": expected,
+        "delivered": delivered,
+        "missing": expected - delivered,
+        "messages_per_second": delivered / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": (latencies[-1] if latencies else 0.0) * 1000,
+        },
+        "worker_cpu_ms_per_message": cpu * 1000 / delivered if cpu is not None and delivered else None,
+        "max_concurrency": transport.max_concurrency,
+        "rate_per_second": transport.rate_limiter.rate,
+    }
+
+
+def report(results: List[dict]):
+    print(f"\n{'provider':<10} {'msgs':>7} {'missing':>8} {'msg/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'cpu ms/msg':>11}")
+    for r in results:
+        latency = r["latency_ms"]
+        cpu = f"{r['worker_cpu_ms_per_message']:.2f}" if r["worker_cpu_ms_per_message"] is not None else "n/a"
+        print(
+            f"{r['provider']:<10} {r['delivered']:>7} {r['missing']:>8} {r['messages_per_second']:>8.1f} "
+            f"{latency['p50']:>9.1f} {latency['p95']:>9.1f} {latency['p99']:>9.1f} {cpu:>11}"
+        )
+    for r in results:
+        print(
+            f"  {r['provider']}: {r['operations']} requests in {r['requests_seconds']:.1f}s "
+            f"({r['failed_requests']} failed), concurrency {r['max_concurrency']}, rate limit {r['rate_per_second']}/s"
+        )
+
+
+async def main_async(args) -> List[dict]:
+    ids = seed(args.members)
+
+    smtp_sink, http_sink = SMTPSink(args.sink_delay_ms / 1000), HTTPSink(args.sink_delay_ms / 1000)
+    smtp_server = await asyncio.start_server(smtp_sink.handle, "127.0.0.1", 0)
+    http_server = await asyncio.start_server(http_sink.handle, "127.0.0.1", 0)
+    smtp_url = "127.0.0.1:{}".format(smtp_server.sockets[0].getsockname()[1])
+    http_url = "http://127.0.0.1:{}/v3/mail/send".format(http_server.sockets[0].getsockname()[1])
+
+    port = free_port()
+    app_thread = AppThread(port)
+    app_thread.start()
+    while not app_thread.server.started:
+        await asyncio.sleep(0.05)
+
+    providers = ["smtp", "sendgrid"] if args.provider == "both" else [args.provider]
+    results = []
+    try:
+        for index, provider in enumerate(providers):
+            sink, url = (smtp_sink, smtp_url) if provider == "smtp" else (http_sink, http_url)
+            print(f"Running {provider} phase: {args.operations} requests from {args.clients} clients")
+            results.append(await run_phase(
+                args, provider, app_thread, f"http://127.0.0.1:{port}", sink, url, ids, index * args.operations,
+            ))
+    finally:
+        app_thread.stop()
+        smtp_server.close()
+        http_server.close()
+    return results
+
+
+def main():
+    args = parse_args()
+    tmpdir = tempfile.TemporaryDirectory()
+    # The app reads its configuration at import time
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir.name, 'email_bench.db')}"
+    os.environ.setdefault("JWT_SECRET_KEY", "email-benchmark")
+    os.environ.setdefault("ENVIRONMENT", "dev")
+    # One owner drives every request; per-user rate limits would cap the rate
+    os.environ.setdefault("ADMISSION_ENABLED", "false")
+    for name in ("app.services.email_service", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    try:
+        report(asyncio.run(main_async(args)))
+    finally:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
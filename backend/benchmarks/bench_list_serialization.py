@@ -0,0 +1,118 @@
+"""
+Benchmark the list-response serialization paths on large tables.
+
+Compares the legacy path (ORM objects -> Pydantic `from_attributes` models ->
+jsonable_encoder -> JSONResponse) with the fast path used by the list
+endpoints (column tuples -> orjson via RowsJSONResponse), and checks that
+both produce the same JSON.
+
+Run from the backend directory:
+    python -m benchmarks.bench_list_serialization --rows 100000
+"""
+import argparse
+import json
+import os
+import time
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.core.database import Base, SessionLocal, engine
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.schemas.project_schema import ProjectResponse
+from app.schemas.task_schema import TaskResponse
+from app.schemas.user_schema import UserResponse
+from app.utils.fast_json import RowsJSONResponse, response_columns
+
+TASK_STATUSES = list(TaskStatus)
+
+
+def seed(rows: int, batch: int = 10000):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x", "role": "member", "is_active": True}
+            for i in range(rows)
+        ])
+        conn.execute(insert(Project), [
+            {"name": f"Project {i}", "description": "Benchmark project " * 4, "admin_id": 1, "owner_id": 1 + i % rows, "status": ProjectStatus.active}
+            for i in range(rows)
+        ])
+        for start in range(0, rows, batch):
+            conn.execute(insert(Task), [
+                {
+                    "title": f"Task {i}",
+                    "description": "A realistic task description with some free text. " * 4,
+                    "status": TASK_STATUSES[i % len(TASK_STATUSES)],
+                    "project_id": 1 + i % rows,
+                    "assigned_to_id": 1 + i % rows,
+                }
+                for i in range(start, min(start + batch, rows))
+            ])
+
+
+def legacy_path(model, schema) -> bytes:
+    db = SessionLocal()
+    try:
+        objects = db.query(model).all()
+        validated = TypeAdapter(List[schema]).validate_python(objects, from_attributes=True)
+        return JSONResponse(jsonable_encoder(validated)).body
+    finally:
+        db.close()
+
+
+def fast_path(model, schema) -> bytes:
+    db = SessionLocal()
+    try:
+        columns = response_columns(schema, model)
+        rows = db.query(*columns).all()
+        return RowsJSONResponse(rows, [c.key for c in columns]).body
+    finally:
+        db.close()
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Seeding {args.rows} users, projects and tasks ({engine.url})...")
+    seed(args.rows)
+
+    print(f"{'endpoint':<12} {'legacy s':>10} {'fast s':>10} {'speedup':>8} {'bytes':>12}")
+    for name, model, schema in (
+        ("/tasks/", Task, TaskResponse),
+        ("/projects/", Project, ProjectResponse),
+        ("/users/", User, UserResponse),
+    ):
+        legacy_body = legacy_path(model, schema)
+        fast_body = fast_path(model, schema)
+        if json.loads(legacy_body) != orjson.loads(fast_body):
+            raise SystemExit(f"Schema parity check failed for {name}")
+
+        legacy = best_of(lambda: legacy_path(model, schema), args.repeat)
+        fast = best_of(lambda: fast_path(model, schema), args.repeat)
+        print(f"{name:<12} {legacy:>10.3f} {fast:>10.3f} {legacy / fast:>7.1f}x {len(fast_body):>12}")
+
+
+if __name__ == "__main__":
+    main()
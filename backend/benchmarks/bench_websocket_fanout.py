@@ -0,0 +1,283 @@
+"""
+Measure how one worker fans task events out to many WebSocket subscribers.
+
+Seeds a SQLite database, starts the app under uvicorn in a child process,
+opens many `/ws/projects/{project_id}` clients spread over the projects,
+then renames tasks through `PUT /tasks/{task_id}` at a fixed rate. Every
+rename carries a sequence number in the title, so each client can match the
+`task_updated` event it receives to the request that caused it.
+
+Reports:
+- delivery latency (request sent -> event received by a client) percentiles
+- missed events (expected deliveries that never arrived)
+- worker memory per connection (worker RSS growth / connected clients)
+
+The server runs in its own process so its memory is not mixed with the
+clients'. Memory is read from /proc, so it is only reported on Linux.
+
+Run from the backend directory:
+    python -m benchmarks.bench_websocket_fanout --clients 2000 --projects 50 --mutations 300 --rate 20
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+from websockets.asyncio.client import connect
+
+from benchmarks.load_driver import percentile
+
+TITLE_PREFIX = "fanout-"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000, help="WebSocket subscribers")
+    parser.add_argument("--projects", type=int, default=20, help="projects the subscribers are spread over")
+    parser.add_argument("--mutations", type=int, default=200, help="task renames to drive")
+    parser.add_argument("--rate", type=float, default=20.0, help="renames per second")
+    parser.add_argument("--connect-batch", type=int, default=200, help="clients opened concurrently")
+    parser.add_argument("--drain", type=float, default=10.0, help="seconds to wait for late events")
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--json", dest="json_out", help="also write the results to this file")
+    return parser.parse_args()
+
+
+# ---------------- SERVER ----------------
+def serve(port: int):
+    """Child process entry point: run the app on one uvicorn worker."""
+    import uvicorn
+
+    # ConnectionManager prints a line per connect; keep the benchmark output readable
+    sys.stdout = open(os.devnull, "w")
+    from app.main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", ws="websockets")
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed(projects: int) -> dict:
+    """One owner, `projects` projects with one task each. Returns project -> task ids."""
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.user import User
+    from app.utils.auth_utils import hash_password
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        admin = User(name="Fanout Admin", email="admin@fanout.io", hashed_password=hash_password("pw"), role="admin")
+        owner = User(name="Fanout Owner", email="owner@fanout.io", hashed_password=admin.hashed_password, role="owner")
+        db.add_all([admin, owner])
+        db.flush()
+        rows = [Project(name=f"Fanout {i}", description="d", admin_id=admin.id, owner_id=owner.id) for i in range(projects)]
+        db.add_all(rows)
+        db.flush()
+        tasks = [Task(title="fanout", description="x", project_id=p.id) for p in rows]
+        db.add_all(tasks)
+        db.commit()
+        return {task.project_id: task.id for task in tasks}
+
+
+# ---------------- CLIENTS ----------------
+class Subscriber:
+    def __init__(self, url: str, project_id: int):
+        self.url = url
+        self.project_id = project_id
+        self.received: Dict[int, float] = {}
+        self.connected = asyncio.Event()
+        self.error: Optional[str] = None
+
+    async def run(self, stop: asyncio.Event):
+        try:
+            async with connect(self.url, ping_interval=None, open_timeout=30) as ws:
+                self.connected.set()
+                reader = asyncio.ensure_future(self._read(ws))
+                await stop.wait()
+                reader.cancel()
+        except Exception as e:
+            self.error = f"{e.__class__.__name__}: {e}"
+            self.connected.set()
+
+    async def _read(self, ws):
+        async for raw in ws:
+            now = time.perf_counter()
+            event = json.loads(raw)
+            title = event.get("title") or ""
+            if event.get("event") == "task_updated" and title.startswith(TITLE_PREFIX):
+                self.received[int(title[len(TITLE_PREFIX):])] = now
+
+
+async def drive(args, base_url: str, server_pid: int, project_tasks: Dict[int, int]) -> dict:
+    from app.utils.auth_utils import create_access_token
+
+    ws_base = base_url.replace("http://", "ws://")
+    project_ids = sorted(project_tasks)
+    stop = asyncio.Event()
+    results = {"clients": args.clients, "projects": len(project_ids)}
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as http:
+        await http.get("/")  # warm up before the idle memory reading
+        rss_idle = rss_bytes(server_pid)
+
+        # ---- connect ----
+        assigned = [project_ids[i % len(project_ids)] for i in range(args.clients)]
+        subscribers = [Subscriber(f"{ws_base}/ws/projects/{pid}", pid) for pid in assigned]
+        runners = []
+        started = time.perf_counter()
+        for start in range(0, len(subscribers), args.connect_batch):
+            batch = subscribers[start:start + args.connect_batch]
+            runners += [asyncio.ensure_future(s.run(stop)) for s in batch]
+            await asyncio.gather(*(s.connected.wait() for s in batch))
+        connect_seconds = time.perf_counter() - started
+        await asyncio.sleep(1)  # let the server settle before measuring
+        rss_connected = rss_bytes(server_pid)
+
+        live = [s for s in subscribers if s.error is None]
+        per_project = defaultdict(int)
+        for s in live:
+            per_project[s.project_id] += 1
+        errors = [s.error for s in subscribers if s.error]
+        results["connected"] = len(live)
+        results["connect_errors"] = len(errors)
+        results["connect_seconds"] = round(connect_seconds, 2)
+        print(f"Connected {len(live)}/{args.clients} clients in {connect_seconds:.1f}s ({len(errors)} errors)")
+        if errors:
+            print(f"  first error: {errors[0]}")
+
+        # ---- mutations ----
+        headers = {"Authorization": "Bearer " + create_access_token({"sub": "owner@fanout.io"})}
+        sent: Dict[int, float] = {}
+        targets: Dict[int, int] = {}
+        failed_requests = 0
+
+        async def mutate(seq: int, project_id: int):
+            nonlocal failed_requests
+            sent[seq] = time.perf_counter()
+            response = await http.put(f"/tasks/{project_tasks[project_id]}", json={"title": f"{TITLE_PREFIX}{seq}"}, headers=headers)
+            if response.status_code != 200:
+                failed_requests += 1
+
+        requests = []
+        started = time.perf_counter()
+        for seq in range(args.mutations):
+            project_id = project_ids[seq % len(project_ids)]
+            targets[seq] = project_id
+            delay = started + seq / args.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            requests.append(asyncio.ensure_future(mutate(seq, project_id)))
+        await asyncio.gather(*requests)
+
+        # ---- drain ----
+        expected = sum(per_project[targets[seq]] for seq in sent)
+        deadline = time.perf_counter() + args.drain
+        while time.perf_counter() < deadline and sum(len(s.received) for s in live) < expected:
+            await asyncio.sleep(0.1)
+
+        latencies: List[float] = sorted(
+            at - sent[seq] for s in live for seq, at in s.received.items() if seq in sent
+        )
+        delivered = len(latencies)
+        stop.set()
+        await asyncio.gather(*runners, return_exceptions=True)
+
+    results.update({
+        "mutations": args.mutations,
+        "failed_requests": failed_requests,
+        "expected_deliveries": expected,
+        "delivered": delivered,
+        "missed": expected - delivered,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": (latencies[-1] if latencies else 0.0) * 1000,
+        },
+        "rss_idle_mb": rss_idle / 2**20 if rss_idle else None,
+        "rss_connected_mb": rss_connected / 2**20 if rss_connected else None,
+        "bytes_per_connection": (rss_connected - rss_idle) / len(live) if rss_idle and rss_connected and live else None,
+    })
+    return results
+
+
+def report(results: dict):
+    latency = results["latency_ms"]
+    print(f"\n{results['mutations']} renames over {results['projects']} projects ({results['failed_requests']} failed requests)")
+    print(f"Deliveries: {results['delivered']}/{results['expected_deliveries']} ({results['missed']} missed)")
+    print(f"Latency ms: p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+    if results["bytes_per_connection"] is not None:
+        print(
+            f"Worker RSS: {results['rss_idle_mb']:.1f} MB idle -> {results['rss_connected_mb']:.1f} MB connected "
+            f"({results['bytes_per_connection'] / 1024:.1f} KB per connection)"
+        )
+    else:
+        print("Worker RSS: unavailable on this platform")
+
+
+def main():
+    args = parse_args()
+    tmpdir = tempfile.TemporaryDirectory()
+    # The app reads its configuration at import time; the child inherits the environment
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmpdir.name, 'fanout.db')}"
+    os.environ.setdefault("JWT_SECRET_KEY", "fanout-benchmark")
+    # One owner drives every rename; per-user rate limits would cap the rate
+    os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+    project_tasks = seed(args.projects)
+    port = args.port or free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    # A fresh interpreter, so the worker's memory baseline is not the seeder's
+    server = multiprocessing.get_context("spawn").Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/", timeout=1)
+                break
+            except httpx.HTTPError:
+                if time.time() > deadline or not server.is_alive():
+                    sys.exit("Server did not start")
+                time.sleep(0.2)
+
+        results = asyncio.run(drive(args, base_url, server.pid, project_tasks))
+    finally:
+        server.terminate()
+        server.join(10)
+        tmpdir.cleanup()
+
+    report(results)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Replay a realistic mix of API calls against a running server with many
+concurrent clients, and report latency percentiles and throughput per route.
+
+Owners browse their projects, list tasks, change task status and edit team
+membership; members list their projects and tasks and update their own
+tasks. Identities come from the manifest written by seed_dataset.
+
+Run from the backend directory against a seeded server (admission control
+off, or the per-user rate limits become what is measured):
+    python -m benchmarks.seed_dataset --database-url sqlite:///bench.db --create-schema
+    DATABASE_URL=sqlite:///bench.db ADMISSION_ENABLED=false uvicorn app.main:app --workers 1
+    python -m benchmarks.load_driver --base-url http://127.0.0.1:8000 --clients 200 --duration 60
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+TASK_STATUSES = ("in_progress", "incomplete", "completed")
+
+# Relative weights of each operation per client role
+OWNER_MIX = {
+    "GET /projects/": 10,
+    "GET /tasks/project/{id}": 25,
+    "GET /teams/project/{id}/members": 10,
+    "GET /projects/{id}/detail": 5,
+    "GET /dashboard/summary": 5,
+    "GET /tasks/": 5,
+    "PATCH /tasks/{id}/status": 15,
+    "POST /teams/add_member+remove_member": 5,
+    "POST /auth/login": 1,
+}
+MEMBER_MIX = {
+    "GET /projects/": 20,
+    "GET /tasks/": 30,
+    "PATCH /tasks/{id}/status": 10,
+    "POST /auth/login": 1,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    parser.add_argument("--clients", type=int, default=100, help="concurrent virtual users")
+    parser.add_argument("--member-share", type=float, default=0.5, help="fraction of clients logged in as members")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run after ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds over which clients start")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between a client's requests")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_out", help="also write the results to this file")
+    return parser.parse_args()
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route: str, seconds: float, status: Optional[int]):
+        self.latencies[route].append(seconds)
+        if status is None or status >= 400:
+            self.errors[route] += 1
+        self.statuses[route][status or 0] += 1
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class VirtualClient:
+    def __init__(self, http: httpx.AsyncClient, stats: Stats, identity: dict, role: str, manifest: dict, password: str, rng: random.Random):
+        self.http = http
+        self.stats = stats
+        self.identity = identity
+        self.role = role
+        self.manifest = manifest
+        self.password = password
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+        mix = OWNER_MIX if role == "owner" else MEMBER_MIX
+        self.ops, self.weights = list(mix), list(mix.values())
+
+    async def call(self, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await self.http.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(route, time.perf_counter() - start, None)
+            return None
+        self.stats.record(route, time.perf_counter() - start, response.status_code)
+        return response
+
+    async def login(self):
+        response = await self.call(
+            "POST /auth/login", "POST", "/auth/login",
+            data={"username": self.identity["email"], "password": self.password},
+        )
+        if response is not None and response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def project(self) -> Optional[str]:
+        projects = self.identity.get("projects")
+        return str(self.rng.choice(projects)) if projects else None
+
+    async def step(self):
+        op = self.rng.choices(self.ops, self.weights)[0]
+        project_id = self.project() if self.role == "owner" else None
+
+        if op == "POST /auth/login":
+            await self.login()
+        elif op in ("GET /projects/", "GET /tasks/", "GET /dashboard/summary"):
+            await self.call(op, "GET", op.split(" ", 1)[1])
+        elif op == "GET /tasks/project/{id}":
+            await self.call(op, "GET", f"/tasks/project/{project_id}")
+        elif op == "GET /teams/project/{id}/members":
+            await self.call(op, "GET", f"/teams/project/{project_id}/members")
+        elif op == "GET /projects/{id}/detail":
+            await self.call(op, "GET", f"/projects/{project_id}/detail")
+        elif op == "PATCH /tasks/{id}/status":
+            tasks = self.identity.get("tasks") if self.role == "member" else self.manifest["projects"][project_id]["tasks"]
+            if tasks:
+                await self.call(op, "PATCH", f"/tasks/{self.rng.choice(tasks)}/status", json={"status": self.rng.choice(TASK_STATUSES)})
+        elif op == "POST /teams/add_member+remove_member":
+            project = self.manifest["projects"][project_id]
+            if project["teams"] and project["outsiders"]:
+                payload = {"team_id": self.rng.choice(project["teams"]), "user_id": self.rng.choice(project["outsiders"])}
+                added = await self.call("POST /teams/add_member", "POST", "/teams/add_member", json=payload)
+                if added is not None and added.status_code == 200:
+                    await self.call("POST /teams/remove_member", "POST", "/teams/remove_member", json=payload)
+
+    async def run(self, start_delay: float, deadline: float, think: float):
+        await asyncio.sleep(start_delay)
+        await self.login()
+        while time.perf_counter() < deadline:
+            await self.step()
+            if think:
+                await asyncio.sleep(think)
+
+
+def report(stats: Stats, elapsed: float) -> dict:
+    print(f"\n{'route':<40} {'count':>8} {'err':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    results = {}
+    total = 0
+    for route in sorted(stats.latencies):
+        values = sorted(stats.latencies[route])
+        total += len(values)
+        row = {
+            "count": len(values),
+            "errors": stats.errors[route],
+            "rps": len(values) / elapsed,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000,
+            "mean_ms": statistics.fmean(values) * 1000,
+            "statuses": dict(stats.statuses[route]),
+        }
+        results[route] = row
+        print(
+            f"{route:<40} {row['count']:>8} {row['errors']:>6} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+    print(f"\n{total} requests in {elapsed:.1f}s: {total / elapsed:.1f} req/s overall")
+    return {"elapsed_s": elapsed, "requests": total, "rps": total / elapsed, "routes": results}
+
+
+async def main_async(args) -> dict:
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    rng = random.Random(args.seed)
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as http:
+        clients = []
+        for i in range(args.clients):
+            as_member = manifest["members"] and rng.random() < args.member_share
+            identity = rng.choice(manifest["members"] if as_member else manifest["owners"])
+            clients.append(VirtualClient(
+                http, stats, identity, "member" if as_member else "owner",
+                manifest, manifest["password"], random.Random(rng.random()),
+            ))
+
+        started = time.perf_counter()
+        deadline = started + args.ramp_up + args.duration
+        await asyncio.gather(*(
+            client.run(args.ramp_up * i / max(1, args.clients), deadline, args.think_ms / 1000)
+            for i, client in enumerate(clients)
+        ))
+        elapsed = time.perf_counter() - started
+
+    return report(stats, elapsed)
+
+
+def main():
+    args = parse_args()
+    results = asyncio.run(main_async(args))
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Check that every HTTP endpoint runs a bounded number of SQL statements.
+
+Each endpoint is called against an in-memory SQLite database seeded at two
+sizes. A case fails when its statement count exceeds the declared budget, or
+when the count at the larger size is higher than at the smaller one (the cost
+grows with N: an N+1). Failures list the statements whose shapes repeated,
+so the offending lazy load is easy to spot. Exits non-zero on any failure,
+so it can gate CI.
+
+Every route must have a case or an explicit exclusion; a new endpoint
+without a budget fails the check too.
+
+Run from the backend directory:
+    python -m benchmarks.query_budget
+    python -m benchmarks.query_budget --sizes 3 40 --verbose
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# The app reads its configuration at import time
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("JWT_SECRET_KEY", "query-budget")
+
+
+@dataclass
+class Case:
+    method: str
+    route: str  # path template, as registered on the app
+    budget: int
+    role: Optional[str] = "owner"  # caller; None sends no token
+    path: Optional[Callable[[dict], str]] = None  # concrete path from the seeded ids
+    kwargs: Callable[[dict], dict] = field(default=lambda ids: {})
+    expect: int = 200
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+def _ndjson(lines: List[str]) -> bytes:
+    return ("\n".join(lines) + "\n").encode()
+
+
+# Mutations run after the reads that share their data, and destructive calls
+# target rows nothing else uses, so the order below is significant.
+CASES: List[Case] = [
+    Case("GET", "/", 0, role=None),
+    # ---------------- AUTH ----------------
+    Case("POST", "/auth/register", 3, role=None, expect=201,
+         kwargs=lambda ids: {"json": {"name": "New", "email": "new@budget.io", "password": "pw"}}),
+    Case("POST", "/auth/login", 1, role=None,
+         kwargs=lambda ids: {"data": {"username": "owner@budget.io", "password": "pw"}}),
+    # ---------------- USERS ----------------
+    Case("GET", "/users/me", 1),
+    Case("GET", "/users/admin", 1, role="admin"),
+    Case("GET", "/users/owner-or-admin", 1),
+    Case("GET", "/users/member", 1, role="member"),
+    Case("GET", "/users/", 2, role="admin"),
+    Case("GET", "/users/members", 2),
+    Case("PATCH", "/users/{user_id}/role", 4, role="admin",
+         path=lambda ids: f"/users/{ids['spare_member']}/role", kwargs=lambda ids: {"json": {"role": "owner"}}),
+    Case("PATCH", "/users/{user_id}/status", 3, role="admin",
+         path=lambda ids: f"/users/{ids['spare_member']}/status", kwargs=lambda ids: {"json": {"is_active": True}}),
+    # ---------------- PROJECTS ----------------
+    Case("GET", "/projects/", 3),
+    Case("GET", "/projects/", 3, role="member"),
+    Case("GET", "/projects/collaboration", 2),
+    Case("GET", "/projects/{project_id}", 2, path=lambda ids: f"/projects/{ids['project']}"),
+    Case("GET", "/projects/{project_id}/detail", 6, path=lambda ids: f"/projects/{ids['project']}/detail"),
+    Case("POST", "/projects/", 5, role="admin", expect=201,
+         kwargs=lambda ids: {"json": {"name": "Budget project", "description": "d", "owner_id": ids["owner"]}}),
+    Case("PUT", "/projects/{project_id}", 4, role="admin",
+         path=lambda ids: f"/projects/{ids['project']}", kwargs=lambda ids: {"json": {"description": "changed"}}),
+    # ---------------- TASKS ----------------
+    Case("GET", "/tasks/", 2),
+    Case("GET", "/tasks/", 2, role="member"),
+    Case("GET", "/tasks/project/{project_id}", 4, path=lambda ids: f"/tasks/project/{ids['project']}"),
+    Case("GET", "/tasks/{task_id}", 3, path=lambda ids: f"/tasks/{ids['task']}"),
+    Case("POST", "/tasks/", 7, expect=201,
+         kwargs=lambda ids: {"json": {"title": "New task", "project_id": ids["project"], "assigned_to_id": ids["member"]}}),
+    # SQLite reads the task around its UPDATE; PostgreSQL does it in one UPDATE ... RETURNING (2 fewer)
+    Case("PUT", "/tasks/{task_id}", 6,
+         path=lambda ids: f"/tasks/{ids['task']}", kwargs=lambda ids: {"json": {"title": "Renamed", "status": "completed"}}),
+    Case("PATCH", "/tasks/{task_id}/status", 6, role="member",
+         path=lambda ids: f"/tasks/{ids['task']}/status", kwargs=lambda ids: {"json": {"status": "incomplete"}}),
+    Case("DELETE", "/tasks/{task_id}", 6, path=lambda ids: f"/tasks/{ids['spare_task']}"),
+    # ---------------- TEAMS ----------------
+    Case("GET", "/teams/", 3),
+    Case("GET", "/teams/", 3, role="member"),
+    Case("GET", "/teams/project/{project_id}", 5, path=lambda ids: f"/teams/project/{ids['project']}"),
+    Case("GET", "/teams/project/{project_id}/members", 5, path=lambda ids: f"/teams/project/{ids['project']}/members"),
+    Case("GET", "/teams/project/{project_id}/available-users", 4,
+         path=lambda ids: f"/teams/project/{ids['project']}/available-users"),
+    Case("POST", "/teams/", 7, expect=201, kwargs=lambda ids: {"json": {"name": "New team", "project_id": ids["project"]}}),
+    Case("POST", "/teams/add_member", 6,
+         kwargs=lambda ids: {"json": {"team_id": ids["team"], "user_id": ids["outsider"]}}),
+    Case("POST", "/teams/remove_member", 6,
+         kwargs=lambda ids: {"json": {"team_id": ids["team"], "user_id": ids["outsider"]}}),
+    # ---------------- DASHBOARD ----------------
+    Case("GET", "/dashboard/summary", 6),
+    Case("GET", "/dashboard/summary", 6, role="member"),
+    Case("GET", "/dashboard/summary", 6, role="admin"),
+    # ---------------- EXPORTS ----------------
+    Case("GET", "/exports/tasks", 2),
+    Case("GET", "/exports/projects", 2, role="member"),
+    Case("GET", "/exports/users", 2, role="admin"),
+    # ---------------- ADMIN ----------------
+    Case("GET", "/admin/metrics", 2, role="admin"),
+    Case("GET", "/admin/slow-requests", 1, role="admin"),
+    Case("GET", "/admin/slow-requests/{record_id}", 1, role="admin", expect=404,
+         path=lambda ids: "/admin/slow-requests/999999"),
+    Case("GET", "/admin/loop-stalls", 1, role="admin"),
+    Case("POST", "/admin/import/{kind}", 6, role="admin", path=lambda ids: "/admin/import/tasks",
+         kwargs=lambda ids: {"files": {"file": ("tasks.ndjson", _ndjson([
+             f'{{"title": "Imported {i}", "project_id": {ids["project"]}, "assigned_to_id": {ids["member"]}}}'
+             for i in range(ids["n"])
+         ]))}}),
+    Case("GET", "/metrics", 0, role=None),
+    # Last: removes the project and everything below it
+    Case("DELETE", "/projects/{project_id}", 11, role="admin", path=lambda ids: f"/projects/{ids['spare_project']}"),
+]
+
+# Routes deliberately left without a budget
+EXCLUDED: Dict[str, str] = {
+    "POST /auth/test-email": "no database access; sends a real email",
+    "POST /admin/profile": "samples stacks for seconds; no database access",
+    "WS /ws/projects/{project_id}": "websocket; not an HTTP request",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs=2, default=[3, 30], metavar=("SMALL", "LARGE"),
+                        help="scale factors for the two seeded datasets")
+    parser.add_argument("--verbose", action="store_true", help="print every statement of failing cases")
+    return parser.parse_args()
+
+
+def seed(n: int) -> dict:
+    """
+    Seed a dataset that scales with `n`: the owner has n projects, the main
+    project has n teams of n members and n tasks per member.
+    """
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.team import Team
+    from app.models.user import User
+    from app.services.notification_service import invalidate_admin_emails
+    from app.services.response_cache import response_cache
+    from app.utils.auth_utils import hash_password
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    response_cache.clear()
+    invalidate_admin_emails()
+
+    hashed = hash_password("pw")
+    with SessionLocal() as db:
+        def user(name, role):
+            return User(name=name, email=f"{name}@budget.io", hashed_password=hashed, role=role)
+
+        admin, owner = user("admin", "admin"), user("owner", "owner")
+        members = [user(f"member{i}" if i else "member", "member") for i in range(n * n)]
+        outsider, spare_member = user("outsider", "member"), user("spare", "member")
+        db.add_all([admin, owner, *members, outsider, spare_member])
+        db.flush()
+
+        projects = [
+            Project(name=f"Project {i}", description="d", admin_id=admin.id, owner_id=owner.id)
+            for i in range(n + 1)
+        ]
+        db.add_all(projects)
+        db.flush()
+        main, spare_project = projects[0], projects[-1]
+
+        for project in projects:
+            teams = n if project is main else 1
+            for t in range(teams):
+                team = Team(name=f"Team {project.id}-{t}", project_id=project.id, owner_id=owner.id)
+                team.members = [owner, *members[t * n:(t + 1) * n]]
+                db.add(team)
+            for member in members[:n]:
+                db.add_all(
+                    Task(title=f"Task {k}", description="x", project_id=project.id, assigned_to_id=member.id)
+                    for k in range(n)
+                )
+        db.flush()
+
+        tasks = db.query(Task.id).filter(Task.project_id == main.id, Task.assigned_to_id == members[0].id).order_by(Task.id).all()
+        team = db.query(Team.id).filter(Team.project_id == main.id).order_by(Team.id).first()
+        ids = {
+            "n": n,
+            "owner": owner.id,
+            "member": members[0].id,
+            "outsider": outsider.id,
+            "spare_member": spare_member.id,
+            "project": main.id,
+            "spare_project": spare_project.id,
+            "team": team.id,
+            "task": tasks[0].id,
+            "spare_task": tasks[-1].id,
+        }
+        db.commit()
+    return ids
+
+
+def run_cases(client, n: int, statements: List[str]) -> Dict[int, dict]:
+    from app.utils.auth_utils import create_access_token
+
+    ids = seed(n)
+    tokens = {
+        role: {"Authorization": "Bearer " + create_access_token({"sub": f"{role}@budget.io"})}
+        for role in ("admin", "owner", "member")
+    }
+
+    results = {}
+    for index, case in enumerate(CASES):
+        path = case.path(ids) if case.path else case.route
+        headers = tokens[case.role] if case.role else {}
+        statements.clear()
+        response = client.request(case.method, path, headers=headers, **case.kwargs(ids))
+        results[index] = {"status": response.status_code, "statements": list(statements)}
+    return results
+
+
+def repeated_shapes(statements: List[str]) -> Counter:
+    from app.core.query_tracer import statement_shape
+
+    shapes = Counter(statement_shape(s) for s in statements)
+    return Counter({shape: count for shape, count in shapes.items() if count > 1})
+
+
+def check_coverage(app) -> List[str]:
+    covered = {case.name for case in CASES}
+    missing = []
+    for route in app.routes:
+        methods = getattr(route, "methods", None)
+        if methods is None:
+            names = [f"WS {route.path}"]
+        else:
+            names = [f"{method} {route.path}" for method in methods if method != "HEAD"]
+        for name in names:
+            if route.path.startswith(("/docs", "/redoc", "/openapi")):
+                continue
+            if name not in covered and name not in EXCLUDED:
+                missing.append(name)
+    return sorted(missing)
+
+
+def main():
+    args = parse_args()
+    small, large = args.sizes
+    if small >= large:
+        sys.exit("--sizes: SMALL must be lower than LARGE")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.core.database import engine
+    from app.main import app
+
+    statements: List[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    failures = []
+    with TestClient(app) as client:
+        runs = {n: run_cases(client, n, statements) for n in (small, large)}
+
+    print(f"{'endpoint':<48} {'role':<7} {'status':>6} {'n=' + str(small):>7} {'n=' + str(large):>7} {'budget':>7}")
+    for index, case in enumerate(CASES):
+        a, b = runs[small][index], runs[large][index]
+        count_a, count_b = len(a["statements"]), len(b["statements"])
+        problems = []
+        if a["status"] != case.expect or b["status"] != case.expect:
+            problems.append(f"expected status {case.expect}, got {a['status']}/{b['status']}")
+        if max(count_a, count_b) > case.budget:
+            problems.append(f"{max(count_a, count_b)} statements, budget is {case.budget}")
+        if count_b > count_a:
+            problems.append(f"statement count grows with N ({count_a} -> {count_b})")
+
+        flag = "  FAIL" if problems else ""
+        print(f"{case.name:<48} {case.role or '-':<7} {b['status']:>6} {count_a:>7} {count_b:>7} {case.budget:>7}{flag}")
+        if problems:
+            failures.append((case, problems, b["statements"]))
+
+    missing = check_coverage(app)
+
+    for case, problems, executed in failures:
+        print(f"\nFAIL {case.name} ({case.role or 'anonymous'}): {'; '.join(problems)}")
+        for shape, count in repeated_shapes(executed).most_common():
+            print(f"  {count}x {shape[:300]}")
+        if args.verbose:
+            for statement in executed:
+                print(f"    {' '.join(statement.split())[:300]}")
+    if missing:
+        print("\nRoutes without a query budget (add a case or an exclusion):")
+        for name in missing:
+            print(f"  {name}")
+
+    if failures or missing:
+        sys.exit(1)
+    print(f"\nAll {len(CASES)} cases within budget.")
+
+
+if __name__ == "__main__":
+    main()
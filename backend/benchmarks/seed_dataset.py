@@ -0,0 +1,216 @@
+"""
+Seed a database with a synthetic dataset of configurable size, using the
+application's models, and write a manifest the load driver replays against.
+
+Everything is inserted with bulk statements (COPY on PostgreSQL) in batches,
+then the counters table is rebuilt. All users share one password so the load
+driver can log in as anyone.
+
+Run from the backend directory, against the database the server will use:
+    python -m benchmarks.seed_dataset --database-url sqlite:///bench.db --create-schema \\
+        --users 50000 --projects 5000 --tasks 1000000 --manifest bench_manifest.json
+"""
+import argparse
+import json
+import os
+import random
+import time
+from collections import defaultdict
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///bench.db"))
+    parser.add_argument("--create-schema", action="store_true", help="create tables with metadata.create_all (skip when migrated)")
+    parser.add_argument("--users", type=int, default=5_000, help="total users, including owners and one admin")
+    parser.add_argument("--owners", type=int, default=None, help="owner accounts (default: users / 50)")
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--teams-per-project", type=int, default=3)
+    parser.add_argument("--members-per-team", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--password", default="benchmark-password")
+    parser.add_argument("--tag", default="bench", help="suffix for generated emails, so runs can share a database")
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    parser.add_argument("--sample-tasks", type=int, default=20, help="task ids per project recorded in the manifest")
+    return parser.parse_args()
+
+
+def batched(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def main():
+    args = parse_args()
+    # The app reads its configuration at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+    from sqlalchemy import func, select
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.project import Project, ProjectStatus
+    from app.models.task import Task, TaskStatus
+    from app.models.team import Team, team_members
+    from app.models.user import User
+    from app.services.counter_service import rebuild_counters
+    from app.utils.auth_utils import hash_password
+    from app.utils.db_utils import bulk_insert
+
+    rng = random.Random(args.seed)
+    owners = args.owners or max(1, args.users // 50)
+    members = max(1, args.users - owners - 1)
+    started = time.perf_counter()
+
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+
+    def insert_all(table, rows, label):
+        t = time.perf_counter()
+        for chunk in batched(rows, args.batch):
+            with engine.begin() as conn:
+                bulk_insert(conn, table, chunk)
+        print(f"  {label:<12} {len(rows):>10,} rows  {time.perf_counter() - t:6.1f}s")
+
+    print(f"Seeding {engine.url.render_as_string(hide_password=True)}")
+
+    # ---------------- USERS ----------------
+    hashed = hash_password(args.password)  # one bcrypt hash shared by everyone
+    admin_email = f"admin.{args.tag}@bench.io"
+    users = [{"name": "Bench Admin", "email": admin_email, "hashed_password": hashed, "role": "admin", "is_active": True}]
+    users += [
+        {"name": f"Owner {i}", "email": f"owner{i}.{args.tag}@bench.io", "hashed_password": hashed, "role": "owner", "is_active": True}
+        for i in range(owners)
+    ]
+    users += [
+        {"name": f"Member {i}", "email": f"member{i}.{args.tag}@bench.io", "hashed_password": hashed, "role": "member", "is_active": True}
+        for i in range(members)
+    ]
+    insert_all(User.__table__, users, "users")
+
+    with SessionLocal() as db:
+        suffix = f".{args.tag}@bench.io"
+        rows = db.execute(select(User.id, User.email, User.role).where(User.email.like(f"%{suffix}"))).all()
+    admin_id = next(uid for uid, _, role in rows if role == "admin")
+    owner_ids = sorted(uid for uid, _, role in rows if role == "owner")
+    member_ids = sorted(uid for uid, _, role in rows if role == "member")
+    email_of = {uid: email for uid, email, _ in rows}
+
+    # ---------------- PROJECTS ----------------
+    project_name = f"Bench project {{}} ({args.tag})"
+    projects = [
+        {
+            "name": project_name.format(i),
+            "description": "Synthetic project for load testing. " * 3,
+            "admin_id": admin_id,
+            "owner_id": owner_ids[i % len(owner_ids)],
+            "status": ProjectStatus.active if rng.random() < 0.9 else ProjectStatus.inactive,
+        }
+        for i in range(args.projects)
+    ]
+    insert_all(Project.__table__, projects, "projects")
+
+    with SessionLocal() as db:
+        project_rows = db.execute(
+            select(Project.id, Project.owner_id).where(Project.name.like(f"Bench project % ({args.tag})"))
+        ).all()
+    project_owner = dict(project_rows)
+    project_ids = sorted(project_owner)
+
+    # ---------------- TEAMS + MEMBERSHIPS ----------------
+    teams = [
+        {"name": f"Bench team {p}-{t} ({args.tag})", "project_id": p, "owner_id": project_owner[p]}
+        for p in project_ids
+        for t in range(args.teams_per_project)
+    ]
+    insert_all(Team.__table__, teams, "teams")
+
+    with SessionLocal() as db:
+        team_rows = db.execute(
+            select(Team.id, Team.project_id).where(Team.name.like(f"Bench team % ({args.tag})"))
+        ).all()
+
+    project_teams = defaultdict(list)
+    project_members = defaultdict(set)
+    memberships = []
+    for team_id, project_id in team_rows:
+        project_teams[project_id].append(team_id)
+        chosen = {project_owner[project_id], *rng.sample(member_ids, min(args.members_per_team, len(member_ids)))}
+        project_members[project_id].update(chosen)
+        memberships += [{"team_id": team_id, "user_id": uid} for uid in sorted(chosen)]
+    insert_all(team_members, memberships, "memberships")
+
+    # ---------------- TASKS ----------------
+    statuses = list(TaskStatus)
+    assignable = {p: sorted(m - {project_owner[p]}) or sorted(m) for p, m in project_members.items()}
+    t = time.perf_counter()
+    for start in range(0, args.tasks, args.batch):
+        chunk = []
+        for i in range(start, min(start + args.batch, args.tasks)):
+            project_id = project_ids[rng.randrange(len(project_ids))]
+            candidates = assignable.get(project_id) or member_ids
+            chunk.append({
+                "title": f"Task {i}",
+                "description": "Synthetic task description with some free text. " * rng.randint(1, 6),
+                "status": rng.choice(statuses),
+                "project_id": project_id,
+                "assigned_to_id": candidates[rng.randrange(len(candidates))] if rng.random() < 0.9 else None,
+            })
+        with engine.begin() as conn:
+            bulk_insert(conn, Task.__table__, chunk)
+    print(f"  {'tasks':<12} {args.tasks:>10,} rows  {time.perf_counter() - t:6.1f}s")
+
+    # ---------------- COUNTERS + MANIFEST ----------------
+    with SessionLocal() as db:
+        rebuild_counters(db)
+
+        ranked = select(
+            Task.id, Task.project_id, Task.assigned_to_id,
+            func.row_number().over(partition_by=Task.project_id, order_by=Task.id).label("rank"),
+        ).where(Task.project_id.in_(project_ids)).subquery()
+        sample = db.execute(
+            select(ranked.c.id, ranked.c.project_id, ranked.c.assigned_to_id).where(ranked.c.rank <= args.sample_tasks)
+        ).all()
+
+    project_tasks = defaultdict(list)
+    member_tasks = defaultdict(list)
+    for task_id, project_id, assignee in sample:
+        project_tasks[project_id].append(task_id)
+        if assignee:
+            member_tasks[assignee].append(task_id)
+
+    owner_projects = defaultdict(list)
+    for project_id in project_ids:
+        owner_projects[project_owner[project_id]].append(project_id)
+
+    manifest = {
+        "password": args.password,
+        "admin": admin_email,
+        "owners": [
+            {"email": email_of[oid], "projects": owner_projects[oid]}
+            for oid in owner_ids if owner_projects[oid]
+        ],
+        "members": [
+            {"email": email_of[mid], "tasks": member_tasks[mid]}
+            for mid in member_ids if member_tasks[mid]
+        ][:5000],
+        "projects": {
+            str(p): {
+                "teams": project_teams[p],
+                "tasks": project_tasks[p],
+                # Candidates for add/remove member edits: members not in the project yet
+                "outsiders": [m for m in rng.sample(member_ids, min(20, len(member_ids))) if m not in project_members[p]][:10],
+            }
+            for p in project_ids
+        },
+    }
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f)
+
+    print(f"Done in {time.perf_counter() - started:.1f}s; manifest written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,8 @@ from app.models.user import Base as UserBase
 import app.models.project   # Project model
 import app.models.task      # Task model
 import app.models.team      # Team model 
+import app.models.metric_counter  # Admin metrics counters
+import app.models.scope_version   # ETag version counters
 
 # Use the same Base for all models
 Base = UserBase
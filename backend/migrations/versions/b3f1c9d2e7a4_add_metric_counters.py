@@ -0,0 +1,48 @@
+"""Add metric_counters table for admin dashboard metrics
+
+Revision ID: b3f1c9d2e7a4
+Revises: acd8dc071c62
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c9d2e7a4'
+down_revision: Union[str, Sequence[str], None] = 'acd8dc071c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'metric_counters',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('value', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    # Seed the counters from the current data
+    op.execute("""
+        INSERT INTO metric_counters (name, value)
+        SELECT 'users', COUNT(*) FROM users
+        UNION ALL SELECT 'projects', COUNT(*) FROM projects
+        UNION ALL SELECT 'teams', COUNT(*) FROM teams
+        UNION ALL SELECT 'tasks', COUNT(*) FROM tasks
+        UNION ALL
+        SELECT 'tasks.status.' || CAST(status AS TEXT), COUNT(*)
+        FROM tasks WHERE status IS NOT NULL GROUP BY status
+        UNION ALL
+        SELECT 'projects.status.' || CAST(status AS TEXT), COUNT(*)
+        FROM projects WHERE status IS NOT NULL GROUP BY status
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('metric_counters')
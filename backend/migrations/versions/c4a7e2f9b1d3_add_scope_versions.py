@@ -0,0 +1,33 @@
+"""Add scope_versions table for ETag version counters
+
+Revision ID: c4a7e2f9b1d3
+Revises: b3f1c9d2e7a4
+Create Date: 2026-10-19 11:02:17.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2f9b1d3'
+down_revision: Union[str, Sequence[str], None] = 'b3f1c9d2e7a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'scope_versions',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('scope'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scope_versions')
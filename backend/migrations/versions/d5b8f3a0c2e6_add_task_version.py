@@ -0,0 +1,28 @@
+"""Add version column to tasks for optimistic concurrency
+
+Revision ID: d5b8f3a0c2e6
+Revises: c4a7e2f9b1d3
+Create Date: 2026-10-19 15:24:41.310927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b8f3a0c2e6'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e2f9b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'version')
@@ -12,7 +12,6 @@ export default function AdminDashboard() {
   const [error, setError] = useState("");
   const [activity, setActivity] = useState([]);
   const [projects, setProjects] = useState([]);
-  const [tasks, setTasks] = useState([]);
   const socketsRef = useRef({});
 
   useEffect(() => {
@@ -21,16 +20,14 @@ export default function AdminDashboard() {
       setLoading(true);
       setError("");
       try {
-        const [metricsRes, projectsRes, tasksRes] = await Promise.all([
+        const [metricsRes, summaryRes] = await Promise.all([
           api.get("/admin/metrics"),
-          api.get("/projects/"),
-          api.get("/tasks/")
+          api.get("/dashboard/summary", { params: { recent: 0 } })
         ]);
         
         if (isMounted) {
           setMetrics(metricsRes.data);
-          setProjects(projectsRes.data);
-          setTasks(tasksRes.data);
+          setProjects(summaryRes.data.projects);
         }
       } catch (e) {
         if (isMounted) setError("Failed to load metrics");
@@ -137,9 +134,8 @@ export default function AdminDashboard() {
               <p className="text-gray-500 text-center py-4">No projects found</p>
             ) : (
               projects.map((project) => {
-                const projectTasks = tasks.filter(task => task.project_id === project.id);
-                const projectCompleted = projectTasks.filter(task => task.status === 'completed').length;
-                const projectTotal = projectTasks.length;
+                const projectCompleted = project.tasks_by_status.completed || 0;
+                const projectTotal = project.tasks;
                 const progressPercentage = projectTotal > 0 ? Math.round((projectCompleted / projectTotal) * 100) : 0;
 
                 return (
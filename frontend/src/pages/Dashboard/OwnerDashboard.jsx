@@ -20,44 +20,17 @@ export default function OwnerDashboard() {
       setLoading(true);
       setError("");
       try {
-        // Fetch owner's projects
-        const projectsRes = await api.get("/projects");
-        setProjects(projectsRes.data);
-        
-        // Fetch all tasks from owner's projects in parallel
-        const allTasks = [];
-        if (projectsRes.data.length > 0) {
-          try {
-            const taskPromises = projectsRes.data.map(project => 
-              api.get(`/tasks/project/${project.id}`).catch(e => {
-                console.error(`Failed to fetch tasks for project ${project.id}:`, e);
-                return { data: [] };
-              })
-            );
-            const taskResults = await Promise.all(taskPromises);
-            allTasks.push(...taskResults.flatMap(result => result.data));
-          } catch (e) {
-            console.error("Failed to fetch tasks:", e);
-          }
-        }
-        
-        // Fetch teams
-        const teamsRes = await api.get("/teams");
-        const ownerTeams = teamsRes.data.filter(team => 
-          projectsRes.data.some(project => project.id === team.project_id)
-        );
-        
-        // Calculate metrics
-        const completedTasks = allTasks.filter(t => t.status === 'completed').length;
-        const inProgressTasks = allTasks.filter(t => t.status === 'in_progress').length;
-        const incompleteTasks = allTasks.filter(t => t.status === 'incomplete').length;
-        
+        // Counts per project come pre-aggregated from one endpoint
+        const summaryRes = await api.get("/dashboard/summary");
+        const { totals, projects: projectSummaries } = summaryRes.data;
+
         if (isMounted) {
+          setProjects(projectSummaries);
           setMetrics({
-            projects: projectsRes.data.length,
-            tasks: allTasks.length,
-            teams: ownerTeams.length,
-            members: ownerTeams.reduce((acc, team) => acc + team.member_ids.length, 0)
+            projects: totals.projects,
+            tasks: totals.tasks,
+            teams: totals.teams,
+            members: totals.members
           });
         }
       } catch (e) {
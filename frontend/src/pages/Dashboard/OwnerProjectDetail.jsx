@@ -26,28 +26,18 @@ export default function OwnerProjectDetail() {
     setLoading(true);
     setError("");
     try {
-      // Fetch all data in parallel for faster loading
-      const [
-        projectRes,
-        tasksRes,
-        membersRes,
-        teamsRes,
-        usersRes,
-        allUsersRes
-      ] = await Promise.all([
-        api.get(`/projects/${projectId}`),
-        api.get(`/tasks/project/${projectId}`),
-        api.get(`/teams/project/${projectId}/members`),
-        api.get(`/teams/project/${projectId}`),
-        api.get(`/teams/project/${projectId}/available-users`),
+      // Project, tasks, teams, members and available users come from one endpoint
+      const [detailRes, allUsersRes] = await Promise.all([
+        api.get(`/projects/${projectId}/detail`),
         api.get("/users/members")
       ]);
 
-      setProject(projectRes.data);
-      setTasks(tasksRes.data);
-      setMembers(membersRes.data);
-      setTeams(teamsRes.data);
-      setAvailableUsers(usersRes.data);
+      const detail = detailRes.data;
+      setProject(detail.project);
+      setTasks(detail.tasks);
+      setMembers(detail.members);
+      setTeams(detail.teams);
+      setAvailableUsers(detail.available_users);
       setAllUsers(allUsersRes.data);
     } catch (e) {
       setError("Failed to load project data");